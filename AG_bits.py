@@ -0,0 +1,107 @@
+# Algoritmo Genético para partição de dados com população compactada em bits
+#
+# Mesmo AG de AG.py (torneio de 3, crossover de um ponto, mutação flip-bit),
+# mas a população inteira é uma matriz NumPy uint64: cada linha é um indivíduo
+# e cada bit é um gene (1 bit por gene, contra 28+ bytes de um int em lista).
+# Seleção, crossover e mutação operam na matriz toda, sem deepcopy por indivíduo.
+
+import numpy as np
+
+WORD_BITS = 64
+
+# Número de palavras de 64 bits para n genes
+def words_for(n_genes):
+    return (n_genes + WORD_BITS - 1) // WORD_BITS
+
+# Converte uma matriz 0/1 (indivíduos x genes) para a forma compactada
+def pack(genes):
+    genes = np.asarray(genes, dtype=np.uint8)
+    n_words = words_for(genes.shape[1])
+    padded = np.zeros((genes.shape[0], n_words * WORD_BITS), dtype=np.uint8)
+    padded[:, :genes.shape[1]] = genes
+    return np.packbits(padded, axis=1, bitorder='little').view(np.uint64)
+
+# Converte a população compactada de volta para uma matriz 0/1
+def unpack(population, n_genes):
+    bits = np.unpackbits(population.view(np.uint8), axis=1, bitorder='little')
+    return bits[:, :n_genes]
+
+# População inicial aleatória (bits além de n_genes ficam em zero)
+def random_population(rng, size, n_genes):
+    return pack(rng.integers(0, 2, size=(size, n_genes), dtype=np.uint8))
+
+# Fitness de todos os indivíduos: |total - 2 * soma dos números com gene 1|
+# (processa em blocos para limitar a matriz 0/1 temporária)
+def evaluate_population(population, numbers, block_size=256):
+    numbers = np.asarray(numbers)
+    total = numbers.sum()
+    fits = np.empty(len(population), dtype=numbers.dtype)
+    for start in range(0, len(population), block_size):
+        bits = unpack(population[start:start + block_size], len(numbers))
+        fits[start:start + block_size] = np.abs(total - 2 * (bits @ numbers))
+    return fits
+
+# Seleção por torneio para a população toda: índices dos vencedores
+def tournament_select(rng, fits, tournsize=3):
+    candidates = rng.integers(0, len(fits), size=(len(fits), tournsize))
+    return candidates[np.arange(len(fits)), np.argmin(fits[candidates], axis=1)]
+
+# Máscaras com os bits [0, cut) ligados, uma linha por corte
+def prefix_masks(cuts, n_words):
+    word = cuts // WORD_BITS
+    bit = (cuts % WORD_BITS).astype(np.uint64)
+    positions = np.arange(n_words)
+    partial = np.left_shift(np.uint64(1), bit) - np.uint64(1)
+    full = np.uint64(np.iinfo(np.uint64).max)
+    return np.where(positions < word[:, None], full,
+                    np.where(positions == word[:, None], partial[:, None], np.uint64(0)))
+
+# Crossover de um ponto nos pares (0, 1), (2, 3), ... com probabilidade prob_cross:
+# o filho 1 recebe os genes [0, corte) do pai 1 e o resto do pai 2, e vice-versa
+def one_point_crossover(rng, population, n_genes, prob_cross):
+    first, second = population[0:-1:2], population[1::2]
+    crossing = np.flatnonzero(rng.random(len(second)) < prob_cross)
+    if len(crossing) == 0:
+        return
+    cuts = rng.integers(1, n_genes, size=len(crossing))
+    mask = prefix_masks(cuts, population.shape[1])
+    a, b = first[crossing], second[crossing]
+    first[crossing] = (a & mask) | (b & ~mask)
+    second[crossing] = (b & mask) | (a & ~mask)
+
+# Mutação flip-bit: cada indivíduo é mutado com prob_mut e, nele, cada gene
+# inverte com probabilidade indpb
+def flip_bit_mutation(rng, population, n_genes, prob_mut, indpb):
+    for row in np.flatnonzero(rng.random(len(population)) < prob_mut):
+        positions = np.flatnonzero(rng.random(n_genes) < indpb)
+        np.bitwise_xor.at(population[row], positions // WORD_BITS,
+                          np.left_shift(np.uint64(1), (positions % WORD_BITS).astype(np.uint64)))
+
+# Executa o AG e retorna (melhor genoma 0/1, melhor fitness, fitness médio inicial, fitness médio final)
+def run(numbers, pop_size=50, n_gen=150, prob_cross=0.9, prob_mut=0.02, indpb=0.02, seed=None):
+    rng = np.random.default_rng(seed)
+    n_genes = len(numbers)
+    population = random_population(rng, pop_size, n_genes)
+    fits = evaluate_population(population, numbers)
+    fitness_avg_inicial = fits.mean().item()
+
+    for gen in range(n_gen):
+        # Seleção: cópia em bloco das linhas vencedoras
+        population = population[tournament_select(rng, fits)]
+        one_point_crossover(rng, population, n_genes, prob_cross)
+        flip_bit_mutation(rng, population, n_genes, prob_mut, indpb)
+        fits = evaluate_population(population, numbers)
+
+    best = int(np.argmin(fits))
+    return unpack(population[best:best + 1], n_genes)[0], fits[best].item(), fitness_avg_inicial, fits.mean().item()
+
+def main(n_numbers=30, seed=None):
+    rng = np.random.default_rng(seed)
+    numbers = rng.integers(1, 101, size=n_numbers)
+    _, best, fitness_avg_inicial, fitness_avg_final = run(numbers, seed=seed)
+    print("Fitness médio inicial:", fitness_avg_inicial)
+    print("Fitness médio final:", fitness_avg_final)
+    print("Melhor fitness:", best)
+
+if __name__ == "__main__":
+    main()
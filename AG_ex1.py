@@ -3,9 +3,13 @@
 # Guilherme ferreira Gonçalves 221020561
 
 
+import os
 import random
-import matplotlib.pyplot as plt
+import numpy as np
 from deap import base, creator, tools
+from executors import create_map
+from fitness_cache import FitnessCache, lookup_population, partition_key
+from checkpoint import GenerationLog, load_checkpoint, restore_rng_state, rng_state, save_checkpoint
 
 # Função para criar indivíduos (soluções)
 def create_individual():
@@ -18,55 +22,137 @@ def evaluate(individual, numbers):
     B = [numbers[i] for i in range(len(individual)) if individual[i] == 1]
     return abs(sum(A) - sum(B)),
 
+# Números do problema no processo que avalia (enviados uma vez por trabalhador)
+worker_numbers = None
+
+def init_worker(numbers):
+    global worker_numbers
+    worker_numbers = np.asarray(numbers)
+
+# Fitness de um bloco de genomas (matriz 0/1)
+# |soma(A) - soma(B)| = |total - 2 * soma(B)|, com soma(B) = bloco @ números
+def evaluate_block(block):
+    return np.abs(worker_numbers.sum() - 2 * (block @ worker_numbers))
+
+# Avaliação vetorizada: a população vira uma matriz 0/1, dividida em blocos
+# avaliados por toolbox.map, e os fitness são gravados de uma vez.
+# Com cache, genomas já avaliados (ou repetidos na mesma chamada) não são recalculados
+def evaluate_population(population, blocks=1, cache=None):
+    if not population:
+        return
+    if cache is None:
+        fits = evaluate_genomes(population, blocks)
+    else:
+        keys = [partition_key(ind) for ind in population]
+        fits, pending = lookup_population(cache, keys)
+        if pending:
+            new_fits = evaluate_genomes([population[indices[0]] for indices in pending.values()], blocks)
+            for (key, indices), fit in zip(pending.items(), new_fits):
+                cache.put(key, fit)
+                for i in indices:
+                    fits[i] = fit
+    for ind, fit in zip(population, fits):
+        ind.fitness.values = (fit,)
+
+def evaluate_genomes(genomes, blocks):
+    matrix = np.array(genomes, dtype=np.int8)
+    parts = np.array_split(matrix, min(blocks, len(genomes)))
+    return np.concatenate(list(toolbox.map(evaluate_block, parts))).tolist()
+
+# Uma geração: seleção, crossover, mutação e avaliação dos filhos
+def next_generation(population, prob_cross, prob_mut):
+    # Selecionar a próxima geração
+    offspring = toolbox.select(population, len(population))
+    offspring = list(map(toolbox.clone, offspring))
+    
+    # Crossover e mutação
+    for child1, child2 in zip(offspring[::2], offspring[1::2]):
+        if random.random() < prob_cross:
+            toolbox.mate(child1, child2)
+            del child1.fitness.values
+            del child2.fitness.values
+    
+    for mutant in offspring:
+        if random.random() < prob_mut:
+            toolbox.mutate(mutant)
+            del mutant.fitness.values
+    
+    # Avaliar indivíduos com fitness inválido
+    invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+    toolbox.evaluate_population(invalid_ind)
+    return offspring
+
+# População em forma compacta para o checkpoint: matriz 0/1 e fitness
+def population_state(population):
+    return {"genomes": np.array(population, dtype=np.uint8),
+            "fitness": np.array([ind.fitness.values[0] for ind in population])}
+
+def restore_population(state):
+    population = []
+    for genome, fit in zip(state["population"]["genomes"].tolist(), state["population"]["fitness"].tolist()):
+        ind = creator.Individual(genome)
+        ind.fitness.values = (fit,)
+        population.append(ind)
+    return population
+
 # Função principal para executar o AG
-def main():
-    population = toolbox.population(n=50)
+def main(plotar=True, executor='serial', workers=None, chunksize=1, cache_size=10000,
+         checkpoint=None, checkpoint_every=10, log=None):
+    # Retomar do último checkpoint, se existir (inclui os números do problema)
+    state = load_checkpoint(checkpoint)
+    if state is not None:
+        setup(state["numbers"])
+    elif not hasattr(toolbox, "evaluate"):
+        setup()
+
+    # Executor da avaliação de fitness (serial, thread ou process); os números
+    # do problema são enviados uma vez para cada trabalhador
+    numbers = toolbox.evaluate.keywords["numbers"]
+    evaluation_map, close_map = create_map(executor, workers, chunksize, init_worker, (numbers,))
+    toolbox.register("map", evaluation_map)
+    blocks = 1 if executor == 'serial' else (workers or os.cpu_count())
+    # Cache de fitness (LRU) para genomas repetidos; cache_size=0 desativa
+    cache = FitnessCache(cache_size) if cache_size else None
+    toolbox.register("evaluate_population", evaluate_population, blocks=blocks, cache=cache)
     
     # Parâmetros do algoritmo
     N_GER = 150  # Número de gerações
     PROB_CROSS = 0.9  # Probabilidade de crossover
     PROB_MUT = 0.02  # Probabilidade de mutação
     
-    # Avaliar a população inicial
-    fitnesses = list(map(toolbox.evaluate, population))
-    for ind, fit in zip(population, fitnesses):
-        ind.fitness.values = fit
-    
-    # Fitness médio da população inicial
-    fits = [ind.fitness.values[0] for ind in population]
-    fitness_avg_inicial = sum(fits) / len(population)
+    if state is None:
+        population = toolbox.population(n=50)
+        
+        # Avaliar a população inicial
+        toolbox.evaluate_population(population)
+        
+        # Fitness médio da população inicial
+        fits = [ind.fitness.values[0] for ind in population]
+        fitness_avg_inicial = sum(fits) / len(population)
+        
+        # Armazenar dados para plotar as curvas
+        fitness_curve = []
+        best_ind_curve = []
+        start_gen = 0
+    else:
+        population = restore_population(state)
+        fitness_avg_inicial = state["fitness_avg_inicial"]
+        fitness_curve = state["fitness_curve"]
+        best_ind_curve = state["best_ind_curve"]
+        start_gen = state["generation"]
+        restore_rng_state(state["rng"])
     print("Fitness médio inicial:", fitness_avg_inicial)
     
-    # Armazenar dados para plotar as curvas
-    fitness_curve = []
-    best_ind_curve = []
+    # Estatísticas por geração em arquivo (CSV ou JSONL), gravadas a cada geração
+    generation_log = None
+    if log:
+        generation_log = GenerationLog(log, ["geracao", "fitness_medio", "melhor_fitness"],
+                                       resume_generation=start_gen)
     
     # Algoritmo genético
-    for gen in range(N_GER):
-        # Selecionar a próxima geração
-        offspring = toolbox.select(population, len(population))
-        offspring = list(map(toolbox.clone, offspring))
-        
-        # Crossover e mutação
-        for child1, child2 in zip(offspring[::2], offspring[1::2]):
-            if random.random() < PROB_CROSS:
-                toolbox.mate(child1, child2)
-                del child1.fitness.values
-                del child2.fitness.values
-        
-        for mutant in offspring:
-            if random.random() < PROB_MUT:
-                toolbox.mutate(mutant)
-                del mutant.fitness.values
-        
-        # Avaliar indivíduos com fitness inválido
-        invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-        fitnesses = map(toolbox.evaluate, invalid_ind)
-        for ind, fit in zip(invalid_ind, fitnesses):
-            ind.fitness.values = fit
-        
-        # Substituir a população
-        population[:] = offspring
+    for gen in range(start_gen, N_GER):
+        # Selecionar, cruzar, mutar e avaliar; substituir a população
+        population[:] = next_generation(population, PROB_CROSS, PROB_MUT)
         
         # Fitness médio e melhor indivíduo por geração
         fits = [ind.fitness.values[0] for ind in population]
@@ -75,12 +161,39 @@ def main():
         
         fitness_curve.append(fitness_avg)
         best_ind_curve.append(best_ind)
+        if generation_log:
+            generation_log.write(geracao=gen, fitness_medio=fitness_avg, melhor_fitness=best_ind)
+        
+        # Checkpoint periódico: população, estado aleatório e geração
+        if checkpoint and ((gen + 1) % checkpoint_every == 0 or gen + 1 == N_GER):
+            save_checkpoint(checkpoint, {
+                "generation": gen + 1,
+                "numbers": numbers,
+                "population": population_state(population),
+                "rng": rng_state(),
+                "fitness_avg_inicial": fitness_avg_inicial,
+                "fitness_curve": fitness_curve,
+                "best_ind_curve": best_ind_curve,
+            })
+    
+    if generation_log:
+        generation_log.close()
+    
+    # Libera o executor da avaliação
+    close_map()
+    toolbox.register("map", map)
     
     # Fitness médio da população final
+    fits = [ind.fitness.values[0] for ind in population]
     fitness_avg_final = sum(fits) / len(population)
     print("Fitness médio final:", fitness_avg_final)
+    if cache is not None:
+        print("Cache de fitness:", cache)
     
     # Plotar gráfico de convergência
+    if not plotar:
+        return population
+    import matplotlib.pyplot as plt  # só carrega o matplotlib quando há gráfico
     plt.figure(figsize=(10, 5))
     plt.plot(fitness_curve, label="Fitness médio da população")
     plt.plot(best_ind_curve, label="Melhor fitness")
@@ -90,12 +203,9 @@ def main():
     plt.legend()
     plt.grid(True)
     plt.show()
+    return population
 
-# Definir o problema de minimização
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-
-# Criar toolbox
+# Criar toolbox (as classes do DEAP e os números do problema vêm de setup)
 toolbox = base.Toolbox()
 toolbox.register("individual", create_individual)
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
@@ -104,7 +214,21 @@ toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 toolbox.register("mate", tools.cxOnePoint)
 toolbox.register("mutate", tools.mutFlipBit, indpb=0.02)
 toolbox.register("select", tools.selTournament, tournsize=3)
-toolbox.register("evaluate", evaluate, numbers=[random.randint(1, 100) for _ in range(30)])  # Números aleatórios
+toolbox.register("map", map)
+
+# Define o problema de minimização (uma vez por processo) e registra os números
+# do problema; sem números, sorteia 30 entre 1 e 100 sem mexer no estado do random
+def setup(numbers=None):
+    if not hasattr(creator, "Individual"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+    if numbers is None:
+        rng = random.Random()
+        numbers = [rng.randint(1, 100) for _ in range(30)]  # Números aleatórios
+    toolbox.register("evaluate", evaluate, numbers=numbers)
+    toolbox.register("evaluate_population", evaluate_population)
+    init_worker(numbers)
+    return numbers
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+"""Resolucao em lote de instancias do quebra-cabeca em um pool de processos
+
+Formato do arquivo de instancias: uma instancia por linha, com as pecas do
+estado inicial linha a linha (0 = vazio) e, opcionalmente, "; " seguido das
+pecas do objetivo. Sem objetivo, usa 1, 2, ..., N-1, 0. Linhas vazias e
+linhas iniciadas por # sao ignoradas. Exemplo (8-puzzle):
+
+    2 8 3 1 6 4 0 7 5 ; 1 2 3 8 0 4 7 6 5
+    7 2 4 5 0 6 8 3 1
+"""
+import argparse
+import json
+import math
+import time
+from multiprocessing import Pool
+
+import main
+
+def board_from_tiles(tiles):
+    """Monta a tupla de tuplas de um tabuleiro quadrado a partir da lista de pecas"""
+    n = math.isqrt(len(tiles))
+    if n * n != len(tiles) or sorted(tiles) != list(range(n * n)):
+        raise ValueError(f"Instancia invalida: {tiles}")
+    return tuple(tuple(tiles[r * n:(r + 1) * n]) for r in range(n))
+
+def default_goal(n):
+    """Objetivo padrao: pecas em ordem com o vazio no final"""
+    return board_from_tiles(list(range(1, n * n)) + [0])
+
+def parse_instance(line):
+    """Converte uma linha do arquivo em (inicio, objetivo)"""
+    start_text, _, goal_text = line.partition(';')
+    start = board_from_tiles([int(tile) for tile in start_text.split()])
+    goal = board_from_tiles([int(tile) for tile in goal_text.split()]) if goal_text.strip() else default_goal(len(start))
+    return start, goal
+
+def read_instances(path):
+    """Le todas as instancias de um arquivo"""
+    with open(path) as f:
+        return [parse_instance(line) for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def solve_instance(task):
+    """Resolve uma instancia no processo trabalhador e retorna um dicionario de resultado"""
+    index, start, goal, solver, heuristic = task
+    start_time = time.perf_counter()
+    if not main.is_solvable(start, goal):
+        path = None
+    else:
+        path, _ = solver(start, goal, heuristic)
+    return {
+        'index': index,
+        'solvable': path is not None,
+        'moves': len(path) if path is not None else None,
+        'time': time.perf_counter() - start_time,
+    }
+
+def solve_batch(instances, solver=main.a_star, heuristic=main.h2, processes=None, chunksize=1):
+    """Distribui as instancias em um pool de processos e gera os resultados conforme terminam
+
+    solver e heuristic precisam ser funcoes de modulo (serializaveis). Os
+    resultados chegam fora de ordem; use 'index' para associa-los as instancias.
+    """
+    tasks = ((index, start, goal, solver, heuristic) for index, (start, goal) in enumerate(instances))
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(solve_instance, tasks, chunksize)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolve um arquivo de instancias em paralelo")
+    parser.add_argument('instances', help="arquivo de instancias")
+    parser.add_argument('--solver', choices=['a_star', 'ida_star', 'bidirectional_a_star', 'table_search'],
+                        default='a_star')
+    parser.add_argument('--heuristic', choices=['h1', 'h2', 'h3'], default='h2')
+    parser.add_argument('-j', '--processes', type=int, default=None, help="numero de processos (padrao: todos os nucleos)")
+    parser.add_argument('--chunksize', type=int, default=1)
+    args = parser.parse_args()
+
+    instances = read_instances(args.instances)
+    for result in solve_batch(instances, getattr(main, args.solver), getattr(main, args.heuristic),
+                              args.processes, args.chunksize):
+        print(json.dumps(result), flush=True)
@@ -0,0 +1,198 @@
+"""Benchmarks reproduziveis do quebra-cabeca e dos dois algoritmos geneticos
+
+Cada configuracao roda com sementes fixas (0, 1, ..., repeticoes - 1) e gera
+um registro com tempo de parede, nos por segundo (quebra-cabeca), pico de
+memoria e qualidade da solucao (movimentos, fitness ou distancia). O pico de
+memoria vem de uma execucao extra com tracemalloc, para nao distorcer o tempo.
+
+Conjuntos de instancias:
+    8puzzle-d<D>  8-puzzles soluveis aleatorios com solucao otima de D movimentos
+    arquivo       --instances, no formato de batch.py (ex.: as 100 instancias
+                  de Korf para o 15-puzzle, uma por linha; nao incluidas aqui)
+    uk12, ha30    matrizes de distancias em dados/ (AG_ex2.carregar_matriz)
+    particao      30 numeros aleatorios do AG de particao (AG.py)
+
+Com --baseline, compara com um JSON gravado antes: tempo mediano acima da
+tolerancia ou qualidade pior fazem o script terminar com erro.
+"""
+import argparse
+import csv
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import batch
+import main
+
+PUZZLE_CONFIGS = [
+    ('a_star', 'h2'),
+    ('a_star', 'h3'),
+    ('ida_star', 'h2'),
+]
+
+def depth_layers(goal):
+    """BFS completa a partir do objetivo: lista de estados compactados por profundidade"""
+    rows, cols = len(goal), len(goal[0])
+    bits = main.tile_bits(rows, cols)
+    moves = main.make_move_table(rows, cols)
+    code, blank = main.pack_state(goal)
+    seen = {code}
+    layers = [[code]]
+    frontier = deque([(code, blank)])
+    while frontier:
+        next_frontier = deque()
+        for code, blank in frontier:
+            for neighbor, neighbor_blank in main.get_packed_neighbors(code, blank, moves, bits):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    next_frontier.append((neighbor, neighbor_blank))
+        if next_frontier:
+            layers.append([code for code, _ in next_frontier])
+        frontier = next_frontier
+    return layers
+
+def random_8puzzles(depth, count, seed=0):
+    """Instancias 3x3 soluveis com solucao otima de exatamente depth movimentos"""
+    goal = batch.default_goal(3)
+    layer = sorted(depth_layers(goal)[depth])
+    rng = random.Random(seed)
+    return [(main.unpack_state(code, 3, 3), goal) for code in rng.sample(layer, count)]
+
+def run_puzzle(instances, solver, heuristic):
+    """Resolve todas as instancias e retorna (movimentos totais, nos gerados)"""
+    moves = generated = 0
+    for start, goal in instances:
+        stats = main.SearchStats()
+        path, _ = solver(start, goal, heuristic, stats=stats)
+        moves += len(path) if path is not None else 0
+        generated += stats.generated
+    return moves, generated
+
+def run_partition(seed, numbers):
+    """AG de particao (AG.py): melhor fitness da populacao final"""
+    import AG
+    random.seed(seed)
+    AG.setup(numbers)
+    population = AG.main()
+    return min(ind.fitness.values[0] for ind in population)
+
+def run_tsp(seed, matrix):
+    """AG do caixeiro viajante (AG_ex2.py): melhor distancia encontrada"""
+    import numpy as np
+    import AG_ex2
+    random.seed(seed)
+    np.random.seed(seed)
+    _, distance = AG_ex2.algoritmo_genetico(matrix, plotar=False)
+    return float(distance)
+
+def measure(function, repetitions):
+    """Executa function(seed) com sementes fixas; retorna tempos, resultados e pico de memoria"""
+    times = []
+    results = []
+    for seed in range(repetitions):
+        start_time = time.perf_counter()
+        results.append(function(seed))
+        times.append(time.perf_counter() - start_time)
+    tracemalloc.start()
+    function(0)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return times, results, peak_memory
+
+def benchmark_puzzles(suites, repetitions):
+    records = []
+    for suite, instances in suites:
+        for solver_name, heuristic_name in PUZZLE_CONFIGS:
+            solver, heuristic = getattr(main, solver_name), getattr(main, heuristic_name)
+            heuristic(instances[0][0], instances[0][1])  # aquece caches (ex.: PDB) fora da medicao
+            times, results, peak_memory = measure(lambda seed: run_puzzle(instances, solver, heuristic), repetitions)
+            moves, generated = results[0]
+            records.append({
+                'config': f"{suite}/{solver_name}/{heuristic_name}",
+                'wall_time': statistics.median(times),
+                'nodes_per_sec': generated / statistics.median(times) if times else 0.0,
+                'peak_memory': peak_memory,
+                'quality': moves,
+            })
+    return records
+
+def benchmark_gas(repetitions):
+    import AG_ex2
+    records = []
+    rng = random.Random(0)
+    numbers = [rng.randint(1, 100) for _ in range(30)]
+    configs = [
+        ('particao/AG', lambda seed: run_partition(seed, numbers)),
+        ('uk12/AG_ex2', lambda seed: run_tsp(seed, AG_ex2.carregar_matriz('uk12'))),
+        ('ha30/AG_ex2', lambda seed: run_tsp(seed, AG_ex2.carregar_matriz('ha30'))),
+    ]
+    for name, function in configs:
+        times, results, peak_memory = measure(function, repetitions)
+        records.append({
+            'config': name,
+            'wall_time': statistics.median(times),
+            'nodes_per_sec': None,
+            'peak_memory': peak_memory,
+            'quality': statistics.median(results),
+        })
+    return records
+
+def compare(records, baseline, tolerance):
+    """Lista as regressoes em relacao ao baseline (tempo ou qualidade)"""
+    previous = {record['config']: record for record in baseline}
+    regressions = []
+    for record in records:
+        old = previous.get(record['config'])
+        if old is None:
+            continue
+        if record['wall_time'] > old['wall_time'] * (1 + tolerance):
+            regressions.append(f"{record['config']}: tempo {old['wall_time']:.4f}s -> {record['wall_time']:.4f}s")
+        if record['quality'] > old['quality']:
+            regressions.append(f"{record['config']}: qualidade {old['quality']} -> {record['quality']}")
+    return regressions
+
+def write_csv(path, records):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['config', 'wall_time', 'nodes_per_sec', 'peak_memory', 'quality'])
+        writer.writeheader()
+        writer.writerows(records)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do quebra-cabeca e dos AGs")
+    parser.add_argument('--depths', type=int, nargs='*', default=[16, 20, 24], help="profundidades dos 8-puzzles aleatorios")
+    parser.add_argument('--count', type=int, default=10, help="instancias por profundidade")
+    parser.add_argument('--instances', action='append', default=[], help="arquivo de instancias (formato de batch.py)")
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--skip-ga', action='store_true', help="nao executa os algoritmos geneticos")
+    parser.add_argument('--json', help="grava os resultados em JSON")
+    parser.add_argument('--csv', help="grava os resultados em CSV")
+    parser.add_argument('--baseline', help="JSON de uma execucao anterior para comparacao")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="aumento de tempo tolerado (fracao)")
+    args = parser.parse_args()
+
+    suites = [(f"8puzzle-d{depth}", random_8puzzles(depth, args.count)) for depth in args.depths]
+    suites += [(path, batch.read_instances(path)) for path in args.instances]
+    records = benchmark_puzzles(suites, args.repetitions)
+    if not args.skip_ga:
+        records += benchmark_gas(args.repetitions)
+
+    for record in records:
+        nodes_per_sec = f"{record['nodes_per_sec']:.0f}" if record['nodes_per_sec'] is not None else '-'
+        print(f"{record['config']:<32} {record['wall_time']:>10.4f}s {nodes_per_sec:>12} nos/s "
+              f"{record['peak_memory'] / 1024:>10.0f} KiB  qualidade {record['quality']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(records, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, records)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(records, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSAO: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,119 @@
+# Busca local 2-opt / Or-opt para o caixeiro viajante (modo memético do AG_ex2.py)
+#
+# Cada movimento é avaliado em O(1) pelas arestas removidas e inseridas. Os
+# candidatos ficam restritos às k cidades mais próximas de cada cidade e, com
+# os bits "não olhar", só as cidades perto de uma melhoria recente são revistas.
+
+from collections import deque
+
+import numpy as np
+
+# Para cada cidade, as k cidades mais próximas (sem ela mesma)
+def vizinhos_mais_proximos(matriz_distancias, k):
+    matriz = np.asarray(matriz_distancias)
+    n = len(matriz)
+    k = min(k, n - 1)
+    ordem = np.argsort(matriz, axis=1, kind='stable')
+    return [[int(c) for c in ordem[a] if c != a][:k] for a in range(n)]
+
+# Inverte rota[i..j] (inclusive) e atualiza as posições
+def inverter(rota, posicao, i, j):
+    while i < j:
+        rota[i], rota[j] = rota[j], rota[i]
+        posicao[rota[i]] = i
+        posicao[rota[j]] = j
+        i += 1
+        j -= 1
+
+# 2-opt a partir da cidade a: troca (a, b) e (c, d) por (a, c) e (b, d)
+def melhorar_2opt(rota, posicao, a, dist, vizinhos):
+    n = len(rota)
+    i = posicao[a]
+    b = rota[(i + 1) % n]
+    d_ab = dist[a][b]
+    for c in vizinhos[a]:
+        d_ac = dist[a][c]
+        if d_ac >= d_ab:
+            break  # vizinhos ordenados: nenhum candidato adiante melhora
+        j = posicao[c]
+        d = rota[(j + 1) % n]
+        if c == b or d == a:
+            continue
+        delta = d_ac + dist[b][d] - d_ab - dist[c][d]
+        if delta < 0:
+            # Inverte o trecho b..c (ou o complementar d..a, que dá o mesmo ciclo)
+            if i < j:
+                inverter(rota, posicao, i + 1, j)
+            else:
+                inverter(rota, posicao, j + 1, i)
+            return delta, (a, b, c, d)
+    return 0, None
+
+# Or-opt a partir da cidade a: move o trecho de 1 a 3 cidades que começa em a
+# para entre c e a próxima cidade, na mesma ordem ou invertido
+def melhorar_oropt(rota, posicao, a, dist, vizinhos, tamanho_maximo=3):
+    n = len(rota)
+    i = posicao[a]
+    for tamanho in range(1, min(tamanho_maximo, n - 3) + 1):
+        trecho = [rota[(i + t) % n] for t in range(tamanho)]
+        s1, s2 = trecho[0], trecho[-1]
+        p = rota[(i - 1) % n]
+        q = rota[(i + tamanho) % n]
+        ganho_remocao = dist[p][s1] + dist[s2][q] - dist[p][q]
+        for c in vizinhos[a]:
+            if c in trecho or c == p:
+                continue
+            e = rota[(posicao[c] + 1) % n]
+            if e in trecho:
+                continue
+            delta_direto = dist[c][s1] + dist[s2][e] - dist[c][e] - ganho_remocao
+            delta_invertido = dist[c][s2] + dist[s1][e] - dist[c][e] - ganho_remocao
+            delta = min(delta_direto, delta_invertido)
+            if delta < 0:
+                if delta_invertido < delta_direto:
+                    trecho.reverse()
+                fora = set(trecho)
+                restante = [cidade for cidade in rota if cidade not in fora]
+                k = restante.index(c) + 1
+                rota[:] = restante[:k] + trecho + restante[k:]
+                for pos, cidade in enumerate(rota):
+                    posicao[cidade] = pos
+                return delta, (p, q, c, e, s1, s2)
+    return 0, None
+
+# Aplica 2-opt e Or-opt até não haver melhoria; retorna a variação da distância
+def busca_local(rota, dist, vizinhos, bits_nao_olhar=True):
+    posicao = [0] * len(rota)
+    for pos, cidade in enumerate(rota):
+        posicao[cidade] = pos
+    total = 0
+
+    if bits_nao_olhar:
+        # Fila de cidades "ativas": só elas são examinadas
+        fila = deque(rota)
+        ativa = [True] * len(rota)
+        while fila:
+            a = fila.popleft()
+            ativa[a] = False
+            delta, tocadas = melhorar_2opt(rota, posicao, a, dist, vizinhos)
+            if tocadas is None:
+                delta, tocadas = melhorar_oropt(rota, posicao, a, dist, vizinhos)
+            if tocadas is not None:
+                total += delta
+                for cidade in tocadas + (a,):
+                    if not ativa[cidade]:
+                        ativa[cidade] = True
+                        fila.append(cidade)
+        return total
+
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for a in list(rota):
+            delta, tocadas = melhorar_2opt(rota, posicao, a, dist, vizinhos)
+            if tocadas is None:
+                delta, tocadas = melhorar_oropt(rota, posicao, a, dist, vizinhos)
+            if tocadas is not None:
+                total += delta
+                melhorou = True
+    return total
@@ -0,0 +1,122 @@
+"""Checkpoints e logs de convergencia para execucoes longas dos AGs
+
+save_checkpoint grava o estado da execucao (populacao, fitness, estado dos
+geradores aleatorios, geracao atual) em um arquivo binario com pickle,
+trocando o arquivo de forma atomica para que uma interrupcao no meio da
+escrita nunca corrompa o ultimo checkpoint valido.
+
+GenerationLog acrescenta uma linha por geracao em um arquivo CSV ou JSONL
+(pela extensao), com flush a cada linha. plot_log desenha as curvas depois,
+a partir do arquivo, sem precisar da execucao:
+
+    python checkpoint.py log.jsonl --saida convergencia.png
+"""
+import argparse
+import csv
+import json
+import os
+import pickle
+import random
+
+import numpy as np
+
+def rng_state():
+    """Estado dos geradores aleatorios do random e do NumPy"""
+    return {'random': random.getstate(), 'numpy': np.random.get_state()}
+
+def restore_rng_state(state):
+    random.setstate(state['random'])
+    np.random.set_state(state['numpy'])
+
+def save_checkpoint(path, state):
+    """Grava o dicionario state em path (escrita atomica)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def load_checkpoint(path):
+    """Le o checkpoint de path; None se ainda nao existir"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+class GenerationLog:
+    """Log de estatisticas por geracao, apenas acrescentado (CSV ou JSONL)
+
+    Ao retomar de um checkpoint, linhas de geracoes posteriores a ele (escritas
+    antes da interrupcao) sao descartadas para o log nao ter duplicatas.
+    """
+
+    def __init__(self, path, fields, resume_generation=None):
+        self.path = path
+        self.fields = list(fields)
+        self.csv = path.endswith('.csv')
+        if resume_generation is not None and os.path.exists(path):
+            rows = [row for row in read_log(path) if int(row['geracao']) < resume_generation]
+            self._rewrite(rows)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', newline='')
+        if self.csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fields)
+            if new_file:
+                self.writer.writeheader()
+
+    def _rewrite(self, rows):
+        with open(self.path, 'w', newline='') as f:
+            if self.csv:
+                writer = csv.DictWriter(f, fieldnames=self.fields)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    f.write(json.dumps(row) + '\n')
+
+    def write(self, **row):
+        if self.csv:
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def read_log(path):
+    """Linhas de um log CSV ou JSONL como dicionarios"""
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            return [{key: float(value) for key, value in row.items()} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+def plot_log(path, output=None):
+    """Desenha as colunas de um log por geracao (salva em output ou mostra na tela)"""
+    import matplotlib
+    if output:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    rows = read_log(path)
+    generations = [row['geracao'] for row in rows]
+    plt.figure(figsize=(10, 5))
+    for field in rows[0] if rows else []:
+        if field != 'geracao':
+            plt.plot(generations, [row[field] for row in rows], label=field)
+    plt.xlabel("Geração")
+    plt.legend()
+    plt.grid(True)
+    plt.title(os.path.basename(path))
+    if output:
+        plt.savefig(output)
+    else:
+        plt.show()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grafico de convergencia a partir de um log de geracoes")
+    parser.add_argument('log', help="arquivo .csv ou .jsonl")
+    parser.add_argument('--saida', help="arquivo de imagem (sem ele, abre uma janela)")
+    args = parser.parse_args()
+    plot_log(args.log, args.saida)
@@ -0,0 +1 @@
+# Permite importar os scripts da raiz nos testes
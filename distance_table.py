@@ -0,0 +1,154 @@
+"""Tabela completa de distancias ate o objetivo (8-puzzle)
+
+Uma busca em largura a partir do objetivo grava a distancia exata de todos os
+estados alcancaveis: 9!/2 = 181.440 estados no 3x3, um byte por estado. O
+indice de um estado e posicao do vazio * (N-1)!/2 + codigo de Lehmer da ordem
+das pecas (sem o vazio) dividido por 2. Com numero impar de colunas, a paridade
+dessa ordem nunca muda com os movimentos, entao o codigo dividido por 2 e unico
+entre os estados alcancaveis e a tabela nao tem buracos.
+
+A tabela e gravada em um arquivo binario e lida com mmap, como os PDBs. Uma
+consulta custa O(1) e a solucao otima sai por descida gulosa: a cada passo,
+qualquer vizinho com distancia uma unidade menor.
+"""
+import math
+import mmap
+import os
+import struct
+from collections import deque
+
+from pattern_db import neighbor_cells
+
+MAGIC = b'DST1'
+UNSEEN = 255
+MAX_TILES = 9
+
+def check_board(rows, cols):
+    """Verifica se o tabuleiro cabe na tabela completa (colunas impares, ate 3x3)"""
+    if cols % 2 == 0 or rows * cols > MAX_TILES:
+        raise ValueError(f"Tabela completa de distancias so existe para tabuleiros com colunas impares "
+                         f"e ate {MAX_TILES} posicoes (recebido {rows}x{cols})")
+
+def lehmer_rank(tiles):
+    """Codigo de Lehmer (posicao na ordem lexicografica) de uma permutacao de 1..n"""
+    n = len(tiles)
+    rank = 0
+    used = 0
+    for i, tile in enumerate(tiles):
+        smaller = tile - 1 - (used & ((1 << tile) - 1)).bit_count()
+        rank += smaller * math.factorial(n - 1 - i)
+        used |= 1 << tile
+    return rank
+
+def tile_parity(board):
+    """Paridade da ordem das pecas (sem o vazio); fixa entre estados alcancaveis"""
+    tiles = [tile for tile in board if tile]
+    return sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j]) % 2
+
+def state_index(board):
+    """Indice de um tabuleiro (sequencia plana de pecas) na tabela"""
+    blank = board.index(0)
+    tiles = [tile for tile in board if tile]
+    return blank * (math.factorial(len(tiles)) // 2) + (lehmer_rank(tiles) >> 1)
+
+def build_table(goal):
+    """Distancia de todos os estados alcancaveis ate goal (BFS a partir do objetivo)"""
+    rows, cols = len(goal), len(goal[0])
+    check_board(rows, cols)
+    size = rows * cols
+    cells = neighbor_cells(rows, cols)
+    table = bytearray([UNSEEN]) * (size * math.factorial(size - 1) // 2)
+    board = [tile for row in goal for tile in row]
+    table[state_index(board)] = 0
+    queue = deque([(tuple(board), board.index(0))])
+
+    while queue:
+        board, blank = queue.popleft()
+        d = table[state_index(board)] + 1
+        for cell in cells[blank]:
+            neighbor = list(board)
+            neighbor[blank], neighbor[cell] = neighbor[cell], 0
+            index = state_index(neighbor)
+            if table[index] == UNSEEN:
+                table[index] = d
+                queue.append((tuple(neighbor), cell))
+    return table
+
+def save_table(path, goal, table):
+    """Grava o objetivo e a tabela em um arquivo binario"""
+    rows, cols = len(goal), len(goal[0])
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<BB', rows, cols))
+        f.write(bytes(tile for row in goal for tile in row))
+        f.write(table)
+
+def load_table(path):
+    """Abre um arquivo de tabela com mmap (somente leitura)"""
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:4] != MAGIC:
+        raise ValueError(f"Arquivo de tabela de distancias invalido: {path}")
+    rows, cols = struct.unpack_from('<BB', data, 4)
+    offset = 6
+    goal = tuple(tuple(data[offset + r * cols:offset + (r + 1) * cols]) for r in range(rows))
+    offset += rows * cols
+    return DistanceTable(goal, memoryview(data)[offset:], data)
+
+def load_or_build(goal, path):
+    """Carrega a tabela de path; se nao existir, constroi, grava e carrega"""
+    goal = tuple(tuple(row) for row in goal)
+    if not os.path.exists(path):
+        table = build_table(goal)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        save_table(temp_path, goal, table)
+        os.replace(temp_path, path)
+    distances = load_table(path)
+    if distances.goal != goal:
+        raise ValueError(f"A tabela em {path} foi construida para outro objetivo")
+    return distances
+
+def table_filename(goal):
+    """Nome de arquivo padrao da tabela de um objetivo"""
+    return f"dist_{len(goal)}x{len(goal[0])}_" + "-".join(str(tile) for row in goal for tile in row) + ".bin"
+
+class DistanceTable:
+    """Distancia exata ate o objetivo por consulta na tabela
+
+    Pode ser passada como heuristica (perfeita) para a_star/ida_star; solve
+    devolve a solucao otima sem busca.
+    """
+
+    def __init__(self, goal, table, data=None):
+        self.goal = goal
+        self.table = table
+        self.cells = neighbor_cells(len(goal), len(goal[0]))
+        self.parity = tile_parity([tile for row in goal for tile in row])
+        self.data = data  # mantem o mmap aberto enquanto houver tabela
+
+    def __call__(self, state, goal=None):
+        """Distancia de state ate o objetivo (state precisa ser alcancavel)"""
+        return self.table[state_index([tile for row in state for tile in row])]
+
+    def solve(self, start):
+        """Caminho otimo ate o objetivo (sem o inicio); None se for inalcancavel"""
+        rows, cols = len(self.goal), len(self.goal[0])
+        board = [tile for row in start for tile in row]
+        if tile_parity(board) != self.parity:
+            return None
+        distance = self.table[state_index(board)]
+        path = []
+        blank = board.index(0)
+        while distance:
+            for cell in self.cells[blank]:
+                board[blank], board[cell] = board[cell], 0
+                if self.table[state_index(board)] == distance - 1:
+                    blank = cell
+                    break
+                board[cell], board[blank] = board[blank], 0
+            distance -= 1
+            path.append(tuple(tuple(board[r * cols:(r + 1) * cols]) for r in range(rows)))
+        return path
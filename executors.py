@@ -0,0 +1,45 @@
+"""Executores plugaveis para a avaliacao de fitness dos AGs
+
+create_map devolve uma funcao com a mesma interface de map (registrada como
+toolbox.map nos AGs com DEAP) e uma funcao para liberar os recursos.
+
+O initializer recebe os dados do problema (lista de numeros, matriz de
+distancias) e os guarda em uma variavel global do modulo do AG. No pool de
+processos ele roda uma vez em cada trabalhador, entao os dados sao enviados
+uma unica vez e nao a cada tarefa; nos modos serial e thread roda no processo
+atual.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+MODES = ('serial', 'thread', 'process')
+
+def create_map(mode='serial', workers=None, chunksize=1, initializer=None, initargs=()):
+    """Cria o executor: retorna (map, close)"""
+    if mode not in MODES:
+        raise ValueError(f"Executor desconhecido: {mode} (use {', '.join(MODES)})")
+
+    if mode == 'process':
+        pool = Pool(workers, initializer, initargs)
+
+        def pool_map(function, iterable):
+            return pool.map(function, iterable, chunksize)
+
+        def close():
+            pool.close()
+            pool.join()
+
+        return pool_map, close
+
+    if initializer is not None:
+        initializer(*initargs)
+    if mode == 'serial':
+        return map, lambda: None
+
+    # Threads ajudam quando a avaliacao libera o GIL (operacoes do NumPy)
+    executor = ThreadPoolExecutor(workers)
+
+    def thread_map(function, iterable):
+        return list(executor.map(function, iterable))
+
+    return thread_map, executor.shutdown
@@ -0,0 +1,85 @@
+"""Cache de fitness com descarte LRU para genomas repetidos
+
+As chaves sao formas canonicas dos genomas, para que solucoes equivalentes
+compartilhem a mesma entrada:
+    particao  o complemento tem o mesmo fitness: normaliza para o primeiro gene 0
+    rota      rotacoes e o sentido contrario tem a mesma distancia: comeca na
+              cidade 0 e segue para o menor dos dois vizinhos dela
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+def partition_key(genome):
+    """Chave canonica de um genoma 0/1 da particao"""
+    genes = np.asarray(genome, dtype=np.uint8)
+    if len(genes) and genes[0]:
+        genes = 1 - genes
+    return np.packbits(genes).tobytes() + bytes([len(genes) % 8])
+
+def tour_key(tour):
+    """Chave canonica de uma rota (independente da cidade inicial e do sentido)"""
+    rota = np.asarray(tour)
+    rota = np.roll(rota, -int(np.argmin(rota)))
+    if len(rota) > 2 and rota[1] > rota[-1]:
+        rota = np.concatenate((rota[:1], rota[:0:-1]))
+    return rota.astype(np.int32).tobytes()
+
+class FitnessCache:
+    """Dicionario chave -> fitness com capacidade maxima e descarte LRU"""
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Fitness guardado para key ou None (conta acerto/falta)"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.capacity <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (f"FitnessCache({len(self.entries)}/{self.capacity} entradas, "
+                f"{self.hits} acertos, {self.misses} faltas, taxa {self.hit_rate():.1%})")
+
+def lookup_population(cache, keys):
+    """Separa uma populacao em valores ja conhecidos e indices a avaliar
+
+    Retorna (valores, pendentes): valores[i] e o fitness em cache ou None;
+    pendentes mapeia cada chave sem valor para os indices que a usam, para que
+    genomas repetidos na mesma geracao sejam avaliados uma vez so.
+    """
+    values = [None] * len(keys)
+    pending = {}
+    for i, key in enumerate(keys):
+        if key in pending:
+            cache.hits += 1
+            pending[key].append(i)
+            continue
+        value = cache.get(key)
+        if value is None:
+            pending[key] = [i]
+        else:
+            values[i] = value
+    return values, pending
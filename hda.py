@@ -0,0 +1,162 @@
+"""A* distribuido por hash (HDA*) em varios processos
+
+Cada estado pertence a um unico processo, escolhido pelo hash do estado
+compactado: o dono guarda o g, o pai e a fronteira desse estado. Quem gera um
+sucessor de outro dono envia o no para ele pela fila do dono.
+
+A busca anda em rodadas sincronas: cada processo expande ate round_size nos
+com f menor que a melhor solucao conhecida (incumbente compartilhado), troca
+exatamente um lote com cada outro processo e publica o menor f da sua
+fronteira. A busca termina quando nenhuma fronteira tem f menor que o
+incumbente; como os lotes de uma rodada ja foram todos recebidos nesse ponto,
+nao ha nos em transito e a solucao e otima (heuristica consistente).
+
+Use heuristicas definidas em nivel de modulo (h1, h2, h3 do main), para que
+possam ser enviadas aos processos.
+"""
+import argparse
+import heapq
+import os
+from multiprocessing import Barrier, Lock, Process, Queue, Value
+from multiprocessing.sharedctypes import Array
+
+import main
+
+def owner(code, workers):
+    """Processo dono de um estado compactado (mistura os bits altos e baixos)"""
+    return (((code ^ (code >> 29)) * 0x9E3779B97F4A7C15) >> 40) % workers
+
+def search_worker(index, workers, start, goal, heuristic, round_size, inboxes, requests, replies, best, lock,
+                  min_f, barrier):
+    rows, cols = len(start), len(start[0])
+    bits = main.tile_bits(rows, cols)
+    mask = (1 << bits) - 1
+    moves = main.make_move_table(rows, cols)
+    costs = main.TILE_COSTS[heuristic](goal) if heuristic in main.TILE_COSTS else None
+    goal_code, _ = main.pack_state(goal)
+    start_code, start_blank = main.pack_state(start)
+
+    open_set = []
+    g_score = {}
+    came_from = {}
+
+    def relax(code, blank, g, h, parent):
+        if g >= g_score.get(code, float('inf')) or g + h >= best.value:
+            return
+        g_score[code] = g
+        came_from[code] = parent
+        if code == goal_code:
+            with lock:
+                if g < best.value:
+                    best.value = g
+            return
+        heapq.heappush(open_set, (g + h, h, code, blank))
+
+    if owner(start_code, workers) == index:
+        relax(start_code, start_blank, 0, heuristic(start, goal), None)
+
+    while True:
+        outboxes = [[] for _ in range(workers)]
+        expanded = 0
+        while open_set and expanded < round_size:
+            f, h, current, blank = open_set[0]
+            if f >= best.value:
+                break
+            heapq.heappop(open_set)
+            g = f - h
+            if g != g_score[current]:
+                continue  # entrada obsoleta (o estado foi reaberto com g menor)
+            expanded += 1
+            for neighbor, neighbor_blank in main.get_packed_neighbors(current, blank, moves, bits):
+                if neighbor == came_from[current]:
+                    continue
+                if costs is not None:
+                    tile = (neighbor >> (blank * bits)) & mask
+                    neighbor_h = h + costs[tile][blank] - costs[tile][neighbor_blank]
+                else:
+                    neighbor_h = heuristic(main.unpack_state(neighbor, rows, cols), goal)
+                destination = owner(neighbor, workers)
+                if destination == index:
+                    relax(neighbor, neighbor_blank, g + 1, neighbor_h, current)
+                else:
+                    outboxes[destination].append((neighbor, neighbor_blank, g + 1, neighbor_h, current))
+
+        # Troca de lotes: um por par de processos em toda rodada (mesmo vazio)
+        for destination in range(workers):
+            if destination != index:
+                inboxes[destination].put(outboxes[destination])
+        for _ in range(workers - 1):
+            for node in inboxes[index].get():
+                relax(*node)
+
+        min_f[index] = open_set[0][0] if open_set else float('inf')
+        barrier.wait()
+        done = min(min_f) >= best.value
+        barrier.wait()  # ninguem altera min_f ou o incumbente antes de todos decidirem
+        if done:
+            break
+
+    # Reconstrucao do caminho: o processo principal pergunta o pai de cada estado ao dono
+    while True:
+        code = requests[index].get()
+        if code is None:
+            break
+        replies.put(came_from[code])
+
+def hda_star(start, goal, heuristic, workers=None, round_size=1000):
+    """A* distribuido por hash em workers processos
+
+    Retorna (caminho, g_score) como ida_star: o caminho exclui o inicio e o
+    g_score cobre apenas os estados do caminho. Instancias sem solucao
+    retornam (None, None).
+    """
+    if not main.is_solvable(start, goal):
+        return None, None
+    workers = workers or os.cpu_count() or 1
+    rows, cols = len(start), len(start[0])
+    start_code, _ = main.pack_state(start)
+    goal_code, _ = main.pack_state(goal)
+    if start_code == goal_code:
+        return [], {start_code: 0}
+
+    inboxes = [Queue() for _ in range(workers)]
+    requests = [Queue() for _ in range(workers)]
+    replies = Queue()
+    best = Value('d', float('inf'), lock=False)
+    lock = Lock()
+    min_f = Array('d', workers, lock=False)
+    barrier = Barrier(workers)
+    processes = [Process(target=search_worker,
+                         args=(i, workers, start, goal, heuristic, round_size, inboxes, requests, replies, best, lock,
+                               min_f, barrier))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        codes = [goal_code]
+        while codes[-1] != start_code:
+            requests[owner(codes[-1], workers)].put(codes[-1])
+            codes.append(replies.get())
+    finally:
+        for request in requests:
+            request.put(None)
+        for process in processes:
+            process.join()
+    codes.reverse()
+    path = [main.unpack_state(code, rows, cols) for code in codes[1:]]
+    return path, {code: g for g, code in enumerate(codes)}
+
+if __name__ == "__main__":
+    from batch import parse_instance
+
+    heuristics = {'h1': main.h1, 'h2': main.h2, 'h3': main.h3}
+    parser = argparse.ArgumentParser(description="Resolve uma instancia com A* distribuido por hash")
+    parser.add_argument('instance', help='pecas do inicio (e opcionalmente "; " e as do objetivo)')
+    parser.add_argument('--heuristic', choices=sorted(heuristics), default='h2')
+    parser.add_argument('--workers', type=int, default=None, help="processos (padrao: todos os nucleos)")
+    parser.add_argument('--round-size', type=int, default=1000, help="expansoes por processo em cada rodada")
+    args = parser.parse_args()
+
+    start, goal = parse_instance(args.instance)
+    path, _ = hda_star(start, goal, heuristics[args.heuristic], args.workers, args.round_size)
+    print(f"Movimentos: {len(path)}")
@@ -0,0 +1,170 @@
+# Modelo de ilhas para os algoritmos genéticos (partição e caixeiro viajante)
+#
+# Cada ilha evolui sua própria subpopulação em um processo separado. A cada
+# intervalo_migracao gerações, cada ilha envia seus melhores indivíduos para
+# outra ilha (topologia em anel ou aleatória) por uma fila e recebe migrantes
+# que substituem os seus piores. Todas as ilhas minimizam o fitness.
+
+import argparse
+import random
+from multiprocessing import Process, Queue
+
+import numpy as np
+
+TOPOLOGIAS = ('anel', 'aleatoria')
+
+# Ilha do AG de partição (AG.py, DEAP)
+class IlhaParticao:
+    def __init__(self, numeros, tamanho_populacao=50, prob_cross=0.9, prob_mut=0.02):
+        self.numeros = list(numeros)
+        self.tamanho_populacao = tamanho_populacao
+        self.prob_cross = prob_cross
+        self.prob_mut = prob_mut
+
+    def iniciar(self):
+        import AG
+        from fitness_cache import FitnessCache
+        self.ag = AG
+        AG.setup(self.numeros)
+        AG.toolbox.register("evaluate_population", AG.evaluate_population, cache=FitnessCache())
+        self.populacao = AG.toolbox.population(n=self.tamanho_populacao)
+        AG.toolbox.evaluate_population(self.populacao)
+
+    def geracao(self):
+        self.populacao[:] = self.ag.next_generation(self.populacao, self.prob_cross, self.prob_mut)
+
+    def aptidoes(self):
+        return [ind.fitness.values[0] for ind in self.populacao]
+
+    def emigrantes(self, quantidade):
+        melhores = sorted(self.populacao, key=lambda ind: ind.fitness.values[0])[:quantidade]
+        return [(list(ind), ind.fitness.values[0]) for ind in melhores]
+
+    def imigrar(self, migrantes):
+        piores = sorted(range(len(self.populacao)), key=lambda i: self.populacao[i].fitness.values[0])[-len(migrantes):]
+        for i, (genoma, aptidao) in zip(piores, migrantes):
+            ind = self.ag.creator.Individual(genoma)
+            ind.fitness.values = (aptidao,)
+            self.populacao[i] = ind
+
+    def melhor(self):
+        return self.emigrantes(1)[0]
+
+# Ilha do AG do caixeiro viajante (AG_ex2.py)
+class IlhaTSP:
+    def __init__(self, matriz_distancias, tamanho_populacao=50, probabilidade_crossover=0.9,
+                 probabilidade_mutacao=0.02, memetico=False, k_vizinhos=8):
+        self.matriz_distancias = np.asarray(matriz_distancias)
+        self.tamanho_populacao = tamanho_populacao
+        self.probabilidade_crossover = probabilidade_crossover
+        self.probabilidade_mutacao = probabilidade_mutacao
+        self.memetico = memetico
+        self.k_vizinhos = k_vizinhos
+
+    def iniciar(self):
+        import AG_ex2
+        self.ag = AG_ex2
+        self.melhorar = AG_ex2.preparar_busca_local(self.matriz_distancias, self.k_vizinhos) if self.memetico else None
+        self.populacao = AG_ex2.criar_populacao(self.tamanho_populacao, len(self.matriz_distancias))
+        self.aptidao = AG_ex2.calcular_distancias(self.populacao, self.matriz_distancias)
+
+    def geracao(self):
+        self.populacao = self.ag.proxima_geracao(self.populacao, self.aptidao.tolist(), self.probabilidade_crossover,
+                                                 self.probabilidade_mutacao, self.melhorar)
+        self.aptidao = self.ag.calcular_distancias(self.populacao, self.matriz_distancias)
+
+    def aptidoes(self):
+        return self.aptidao.tolist()
+
+    def emigrantes(self, quantidade):
+        melhores = np.argsort(self.aptidao, kind='stable')[:quantidade]
+        return [(self.populacao[i].tolist(), self.aptidao[i].item()) for i in melhores]
+
+    def imigrar(self, migrantes):
+        piores = np.argsort(self.aptidao, kind='stable')[-len(migrantes):]
+        for i, (rota, aptidao) in zip(piores, migrantes):
+            self.populacao[i] = rota
+            self.aptidao[i] = aptidao
+
+    def melhor(self):
+        return self.emigrantes(1)[0]
+
+# Ilha de destino de cada ilha em uma migração. Na topologia aleatória todas as
+# ilhas sorteiam a mesma permutação sem pontos fixos (mesma semente), então cada
+# uma recebe exatamente uma mensagem
+def destinos(num_ilhas, topologia, semente, geracao):
+    if topologia == 'anel':
+        return [(i + 1) % num_ilhas for i in range(num_ilhas)]
+    rng = random.Random(semente * 1000003 + geracao)
+    ordem = list(range(num_ilhas))
+    while True:
+        rng.shuffle(ordem)
+        if all(destino != i for i, destino in enumerate(ordem)):
+            return ordem
+
+def executar_ilha(indice, problema, num_ilhas, geracoes, intervalo_migracao, num_migrantes, topologia, semente,
+                  caixas, resultados):
+    random.seed(semente + indice)
+    np.random.seed(semente + indice)
+    problema.iniciar()
+    historico = []
+    for geracao in range(1, geracoes + 1):
+        problema.geracao()
+        aptidoes = problema.aptidoes()
+        historico.append((min(aptidoes), sum(aptidoes) / len(aptidoes)))
+
+        if num_ilhas > 1 and intervalo_migracao and geracao % intervalo_migracao == 0 and geracao < geracoes:
+            destino = destinos(num_ilhas, topologia, semente, geracao)[indice]
+            caixas[destino].put(problema.emigrantes(num_migrantes))
+            problema.imigrar(caixas[indice].get())
+
+    resultados.put((indice, problema.melhor(), historico))
+
+# Executa o modelo de ilhas e retorna o melhor global e o histórico de cada ilha
+# (lista de (melhor, média) por geração)
+def executar_ilhas(problema, num_ilhas=4, geracoes=250, intervalo_migracao=10, num_migrantes=2,
+                   topologia='anel', semente=0):
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(f"Topologia desconhecida: {topologia} (use {', '.join(TOPOLOGIAS)})")
+    caixas = [Queue() for _ in range(num_ilhas)]
+    resultados = Queue()
+    processos = [Process(target=executar_ilha,
+                         args=(i, problema, num_ilhas, geracoes, intervalo_migracao, num_migrantes, topologia,
+                               semente, caixas, resultados))
+                 for i in range(num_ilhas)]
+    for processo in processos:
+        processo.start()
+    # Lê os resultados antes do join para não travar com a fila cheia
+    por_ilha = sorted(resultados.get() for _ in processos)
+    for processo in processos:
+        processo.join()
+
+    historicos = [historico for _, _, historico in por_ilha]
+    melhor_solucao, melhor_aptidao = min((melhor for _, melhor, _ in por_ilha), key=lambda m: m[1])
+    return {'melhor': melhor_solucao, 'aptidao': melhor_aptidao, 'historicos': historicos}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AG com modelo de ilhas")
+    parser.add_argument('problema', choices=['particao', 'uk12', 'ha30'])
+    parser.add_argument('--ilhas', type=int, default=4)
+    parser.add_argument('--geracoes', type=int, default=250)
+    parser.add_argument('--intervalo', type=int, default=10, help="gerações entre migrações")
+    parser.add_argument('--migrantes', type=int, default=2)
+    parser.add_argument('--topologia', choices=TOPOLOGIAS, default='anel')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--memetico', action='store_true', help="busca local nos filhos (TSP)")
+    args = parser.parse_args()
+
+    if args.problema == 'particao':
+        rng = random.Random(args.semente)
+        problema = IlhaParticao([rng.randint(1, 100) for _ in range(30)])
+    else:
+        import AG_ex2
+        problema = IlhaTSP(AG_ex2.carregar_matriz(args.problema), memetico=args.memetico)
+
+    resultado = executar_ilhas(problema, args.ilhas, args.geracoes, args.intervalo, args.migrantes,
+                               args.topologia, args.semente)
+    print(f"Melhor solução: {resultado['melhor']}")
+    print(f"Melhor fitness: {resultado['aptidao']}")
+    for i, historico in enumerate(resultado['historicos']):
+        print(f"Ilha {i}: melhor inicial {historico[0][0]}, melhor final {historico[-1][0]}")
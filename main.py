@@ -1,61 +1,451 @@
 import heapq
+import os
 import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import lru_cache
+
+from distance_table import load_or_build as load_or_build_table, table_filename
+from pattern_db import load_or_build, pdb_filename
+
+# Diretorio onde os bancos de dados de padroes (h3) sao gravados
+PDB_DIR = os.environ.get('PUZZLE_PDB_DIR', 'pdbs')
+
+def goal_positions(goal):
+    """Tabela peca -> posicao (linear) no estado objetivo"""
+    cols = len(goal[0])
+    positions = [0] * (len(goal) * cols)
+    for i, row in enumerate(goal):
+        for j, tile in enumerate(row):
+            positions[tile] = i * cols + j
+    return positions
+
+def as_tuple(state):
+    """Converte um estado (listas ou tuplas) em tupla de tuplas"""
+    return tuple(tuple(row) for row in state)
+
+def h1_costs(goal):
+    """Custo de cada peca em cada posicao para h1 (1 se fora do lugar)"""
+    return cached_h1_costs(as_tuple(goal))
+
+def h2_costs(goal):
+    """Custo de cada peca em cada posicao para h2 (distancia ate a posicao objetivo)"""
+    return cached_h2_costs(as_tuple(goal))
+
+@lru_cache(maxsize=None)
+def cached_h1_costs(goal):
+    positions = goal_positions(goal)
+    size = len(positions)
+    return tuple(tuple(0 if tile == 0 or pos == positions[tile] else 1 for pos in range(size))
+                 for tile in range(size))
+
+@lru_cache(maxsize=None)
+def cached_h2_costs(goal):
+    cols = len(goal[0])
+    positions = goal_positions(goal)
+    size = len(positions)
+    return tuple(tuple(0 if tile == 0 else
+                       abs(pos // cols - positions[tile] // cols) + abs(pos % cols - positions[tile] % cols)
+                       for pos in range(size))
+                 for tile in range(size))
 
 def h1(state, goal):
     """Heuristica 1: Contar o numero de pecas fora do lugar"""
-    return sum([1 if state[i][j] != goal[i][j] and state[i][j] != 0 else 0 
-                for i in range(len(state)) for j in range(len(state[0]))])
+    costs = h1_costs(goal)
+    return sum(costs[tile][pos] for pos, tile in enumerate(tile for row in state for tile in row))
 
 def h2(state, goal):
     """Heuristica 2: Distancia de Manhattan"""
-    return sum([abs(i - goal_i) + abs(j - goal_j)
-                for i in range(len(state)) for j in range(len(state[0]))
-                for goal_i in range(len(goal)) for goal_j in range(len(goal[0]))
-                if state[i][j] == goal[goal_i][goal_j] and state[i][j] != 0])
-
-def a_star(start, goal, heuristic):
-    """Implementacao do algoritmo A*"""
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {str(start): 0}
-    f_score = {str(start): heuristic(start, goal)}
-
-    while open_set:
-        _, current = heapq.heappop(open_set)
-
-        if current == goal:
-            path = []
-            while str(current) in came_from:
-                path.append(current)
-                current = came_from[str(current)]
-            path.reverse()
-            return path, g_score
-
-        for neighbor in get_neighbors(current):
-            tentative_g_score = g_score[str(current)] + 1
-            if str(neighbor) not in g_score or tentative_g_score < g_score[str(neighbor)]:
-                came_from[str(neighbor)] = current
-                g_score[str(neighbor)] = tentative_g_score
-                f_score[str(neighbor)] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(open_set, (f_score[str(neighbor)], neighbor))
-
-    return None, None
+    costs = h2_costs(goal)
+    return sum(costs[tile][pos] for pos, tile in enumerate(tile for row in state for tile in row))
+
+def h3(state, goal):
+    """Heuristica 3: Banco de dados de padroes aditivo (carregado do disco com mmap)"""
+    return pattern_database(as_tuple(goal))(state)
+
+@lru_cache(maxsize=None)
+def pattern_database(goal):
+    """PDB do objetivo, construido e gravado em PDB_DIR na primeira vez"""
+    return load_or_build(goal, os.path.join(PDB_DIR, pdb_filename(goal)))
+
+@lru_cache(maxsize=None)
+def distance_table(goal):
+    """Tabela completa de distancias do objetivo (3x3), construida e gravada em PDB_DIR na primeira vez"""
+    return load_or_build_table(goal, os.path.join(PDB_DIR, table_filename(goal)))
+
+# Heuristicas que sao soma de custos por peca: o A* atualiza o valor de forma incremental
+TILE_COSTS = {h1: h1_costs, h2: h2_costs}
+
+def tile_bits(rows, cols):
+    """Numero de bits por peca no estado compactado (4 bits ate o 15-puzzle)"""
+    return max(4, (rows * cols - 1).bit_length())
+
+def pack_state(state):
+    """Compacta um estado em um inteiro (bits por peca) e retorna (estado, posicao do vazio)"""
+    bits = tile_bits(len(state), len(state[0]))
+    code = 0
+    blank = 0
+    for pos, tile in enumerate(tile for row in state for tile in row):
+        code |= tile << (pos * bits)
+        if tile == 0:
+            blank = pos
+    return code, blank
+
+def unpack_state(code, rows, cols):
+    """Reconstroi a tupla de tuplas a partir do estado compactado"""
+    bits = tile_bits(rows, cols)
+    mask = (1 << bits) - 1
+    tiles = [(code >> (pos * bits)) & mask for pos in range(rows * cols)]
+    return tuple(tuple(tiles[r * cols:(r + 1) * cols]) for r in range(rows))
+
+def make_move_table(rows, cols):
+    """Tabela de movimentos: para cada posicao do vazio, as posicoes para onde ele pode ir"""
+    moves = []
+    for pos in range(rows * cols):
+        r, c = divmod(pos, cols)
+        moves.append(tuple(nr * cols + nc
+                           for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                           if 0 <= nr < rows and 0 <= nc < cols))
+    return moves
+
+@dataclass
+class SearchStats:
+    """Contadores e tempos de uma busca (preenchidos por a_star/ida_star)"""
+    expanded: int = 0          # nos retirados da fronteira e expandidos
+    generated: int = 0         # sucessores gerados
+    duplicates: int = 0        # sucessores descartados (ja fechados ou sem melhora em g)
+    stale_pops: int = 0        # entradas obsoletas retiradas do heap
+    peak_open: int = 0         # maior tamanho da fronteira
+    peak_memory: int = 0       # pico de memoria em bytes (com trace_memory)
+    heuristic_time: float = 0.0
+    successor_time: float = 0.0
+    heap_time: float = 0.0
+    total_time: float = 0.0
+    trace_memory: bool = False  # mede peak_memory com tracemalloc (mais lento)
+
+def a_star(start, goal, heuristic, stats=None, callback=None, callback_every=10000):
+    """Implementacao do algoritmo A*
+
+    Retorna (caminho, g_score). O g_score e indexado pelo estado compactado:
+    use g_score[pack_state(estado)[0]] para consultar o custo de um estado.
+    Instancias sem solucao sao rejeitadas antes da busca com (None, None).
+
+    Com stats (SearchStats), preenche os contadores e o tempo gasto em cada
+    etapa. callback(stats) e chamado a cada callback_every expansoes.
+    """
+    if callback is not None and stats is None:
+        stats = SearchStats()
+    timing = stats is not None
+    clock = time.perf_counter
+    expanded = generated = duplicates = stale_pops = peak_open = 0
+    if timing:
+        begin = clock()
+        if stats.trace_memory:
+            tracemalloc.start()
+
+    try:
+        if not is_solvable(start, goal):
+            return None, None
+
+        rows, cols = len(start), len(start[0])
+        bits = tile_bits(rows, cols)
+        mask = (1 << bits) - 1
+        moves = make_move_table(rows, cols)
+        costs = TILE_COSTS[heuristic](goal) if heuristic in TILE_COSTS else None
+        start_code, start_blank = pack_state(start)
+        goal_code, _ = pack_state(goal)
+
+        open_set = []
+        start_h = heuristic(start, goal)
+        heapq.heappush(open_set, (start_h, start_h, start_code, start_blank))
+        came_from = {}
+        g_score = {start_code: 0}
+        closed_set = set()
+        peak_open = 1
+
+        while open_set:
+            if timing:
+                t0 = clock()
+                _, h, current, blank = heapq.heappop(open_set)
+                stats.heap_time += clock() - t0
+            else:
+                _, h, current, blank = heapq.heappop(open_set)
+            if current in closed_set:
+                stale_pops += 1
+                continue
+            closed_set.add(current)
+
+            if current == goal_code:
+                path = []
+                while current in came_from:
+                    path.append(unpack_state(current, rows, cols))
+                    current = came_from[current]
+                path.reverse()
+                return path, g_score
+
+            expanded += 1
+            if callback is not None and expanded % callback_every == 0:
+                stats.expanded, stats.generated, stats.duplicates = expanded, generated, duplicates
+                stats.stale_pops, stats.peak_open = stale_pops, peak_open
+                callback(stats)
+
+            tentative_g_score = g_score[current] + 1
+            if timing:
+                t0 = clock()
+                neighbors = get_packed_neighbors(current, blank, moves, bits)
+                stats.successor_time += clock() - t0
+            else:
+                neighbors = get_packed_neighbors(current, blank, moves, bits)
+            generated += len(neighbors)
+            for neighbor, neighbor_blank in neighbors:
+                if neighbor in closed_set:
+                    duplicates += 1
+                    continue
+                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    if timing:
+                        t0 = clock()
+                    if costs is not None:
+                        # So a peca que ocupou o vazio mudou de lugar
+                        tile = (neighbor >> (blank * bits)) & mask
+                        neighbor_h = h + costs[tile][blank] - costs[tile][neighbor_blank]
+                    else:
+                        neighbor_h = heuristic(unpack_state(neighbor, rows, cols), goal)
+                    if timing:
+                        t1 = clock()
+                        heapq.heappush(open_set, (tentative_g_score + neighbor_h, neighbor_h, neighbor, neighbor_blank))
+                        stats.heuristic_time += t1 - t0
+                        stats.heap_time += clock() - t1
+                    else:
+                        heapq.heappush(open_set, (tentative_g_score + neighbor_h, neighbor_h, neighbor, neighbor_blank))
+                else:
+                    duplicates += 1
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+
+        return None, None
+    finally:
+        if timing:
+            stats.expanded, stats.generated, stats.duplicates = expanded, generated, duplicates
+            stats.stale_pops, stats.peak_open = stale_pops, peak_open
+            if stats.trace_memory:
+                stats.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            stats.total_time = clock() - begin
+
+def is_solvable(start, goal):
+    """Verifica se o objetivo e alcancavel a partir do inicio (paridade de inversoes)
+
+    Um movimento troca o vazio com uma peca vizinha: a paridade da permutacao
+    (contando o vazio) e a paridade da distancia do vazio mudam juntas.
+    """
+    cols = len(start[0])
+    positions = goal_positions(goal)
+    order = [positions[tile] for row in start for tile in row]
+    inversions = sum(1 for i in range(len(order)) for j in range(i + 1, len(order)) if order[i] > order[j])
+    blank, goal_blank = order.index(positions[0]), positions[0]
+    blank_distance = abs(blank // cols - goal_blank // cols) + abs(blank % cols - goal_blank % cols)
+    return (inversions + blank_distance) % 2 == 0
+
+def ida_star(start, goal, heuristic, table_size=None, stats=None):
+    """Implementacao do IDA* (memoria proporcional a profundidade da solucao)
+
+    O tabuleiro e uma unica lista mutavel: cada movimento e feito e desfeito no
+    lugar. Com table_size, uma tabela de transposicao de tamanho fixo (indexada
+    por estado % table_size, sempre sobrescrita) poda estados ja alcancados com
+    custo menor ou igual na iteracao atual. Retorna (None, None) se o objetivo
+    nao for alcancavel. Com stats (SearchStats), conta nos expandidos,
+    gerados e podados pela tabela (duplicates), somando todas as iteracoes.
+    """
+    begin = time.perf_counter()
+    if not is_solvable(start, goal):
+        return None, None
+
+    rows, cols = len(start), len(start[0])
+    bits = tile_bits(rows, cols)
+    moves = make_move_table(rows, cols)
+    costs = TILE_COSTS[heuristic](goal) if heuristic in TILE_COSTS else None
+    start_code, start_blank = pack_state(start)
+    goal_code, _ = pack_state(goal)
+    board = [tile for row in start for tile in row]
+    blanks = []
+    table = [None] * table_size if table_size else None
+    found = -1
+
+    def search(code, blank, g, h, threshold, previous):
+        f = g + h
+        if f > threshold:
+            return f
+        if code == goal_code:
+            return found
+        if table is not None:
+            slot = code % table_size
+            entry = table[slot]
+            if entry is not None and entry[0] == code and entry[1] == threshold and entry[2] <= g:
+                if stats is not None:
+                    stats.duplicates += 1
+                return float('inf')
+            table[slot] = (code, threshold, g)
+
+        if stats is not None:
+            stats.expanded += 1
+        minimum = float('inf')
+        for pos in moves[blank]:
+            if pos == previous:
+                continue
+            if stats is not None:
+                stats.generated += 1
+            tile = board[pos]
+            board[blank], board[pos] = tile, 0
+            if costs is not None:
+                neighbor_h = h + costs[tile][blank] - costs[tile][pos]
+            else:
+                neighbor_h = heuristic(tuple(tuple(board[r * cols:(r + 1) * cols]) for r in range(rows)), goal)
+            blanks.append(pos)
+            t = search(code - (tile << (pos * bits)) + (tile << (blank * bits)), pos, g + 1, neighbor_h, threshold, blank)
+            if t == found:
+                return found
+            blanks.pop()
+            board[blank], board[pos] = 0, tile
+            minimum = min(minimum, t)
+        return minimum
+
+    start_h = heuristic(start, goal)
+    threshold = start_h
+    while True:
+        t = search(start_code, start_blank, 0, start_h, threshold, None)
+        if t == found:
+            break
+        if t == float('inf'):
+            return None, None
+        threshold = t
+
+    if stats is not None:
+        stats.total_time = time.perf_counter() - begin
+
+    # Reconstroi o caminho repetindo os movimentos do vazio a partir do inicio
+    board = [tile for row in start for tile in row]
+    blank = start_blank
+    path = []
+    g_score = {start_code: 0}
+    for g, pos in enumerate(blanks, 1):
+        board[blank], board[pos] = board[pos], 0
+        blank = pos
+        state = tuple(tuple(board[r * cols:(r + 1) * cols]) for r in range(rows))
+        path.append(state)
+        g_score[pack_state(state)[0]] = g
+    return path, g_score
+
+def bidirectional_a_star(start, goal, heuristic):
+    """Busca bidirecional MM (front-to-end), com encontro garantidamente otimo
+
+    As duas buscas usam prioridade max(f, 2g); a direta estima a distancia ate
+    o objetivo com heuristic(estado, goal) e a reversa ate o inicio com
+    heuristic(estado, start). Expande a direcao com menor prioridade minima C
+    e para quando o melhor caminho encontrado U satisfaz U <= C.
+    Retorna (caminho, g_score) como ida_star.
+    """
+    if not is_solvable(start, goal):
+        return None, None
+
+    rows, cols = len(start), len(start[0])
+    bits = tile_bits(rows, cols)
+    mask = (1 << bits) - 1
+    moves = make_move_table(rows, cols)
+    start_code, start_blank = pack_state(start)
+    goal_code, goal_blank = pack_state(goal)
+    if start_code == goal_code:
+        return [], {start_code: 0}
+
+    targets = (goal, start)
+    costs = tuple(TILE_COSTS[heuristic](target) if heuristic in TILE_COSTS else None for target in targets)
+    g_score = ({start_code: 0}, {goal_code: 0})
+    came_from = ({}, {})
+    closed_set = (set(), set())
+    start_h, goal_h = heuristic(start, goal), heuristic(goal, start)
+    open_set = ([(start_h, 0, start_h, start_code, start_blank)], [(goal_h, 0, goal_h, goal_code, goal_blank)])
+
+    best_cost = float('inf')
+    meeting = None
+    while open_set[0] and open_set[1]:
+        # Descarta entradas obsoletas do topo dos dois heaps
+        for d in (0, 1):
+            heap = open_set[d]
+            while heap and (heap[0][1] != g_score[d][heap[0][3]] or heap[0][3] in closed_set[d]):
+                heapq.heappop(heap)
+        if not open_set[0] or not open_set[1]:
+            break
+        if best_cost <= min(open_set[0][0][0], open_set[1][0][0]):
+            break
+
+        d = 0 if open_set[0][0][0] <= open_set[1][0][0] else 1
+        other = 1 - d
+        _, g, h, current, blank = heapq.heappop(open_set[d])
+        closed_set[d].add(current)
+
+        tentative_g_score = g + 1
+        for neighbor, neighbor_blank in get_packed_neighbors(current, blank, moves, bits):
+            if tentative_g_score >= g_score[d].get(neighbor, float('inf')):
+                continue
+            g_score[d][neighbor] = tentative_g_score
+            came_from[d][neighbor] = current
+            closed_set[d].discard(neighbor)
+            if neighbor in g_score[other] and tentative_g_score + g_score[other][neighbor] < best_cost:
+                best_cost = tentative_g_score + g_score[other][neighbor]
+                meeting = neighbor
+            if costs[d] is not None:
+                tile = (neighbor >> (blank * bits)) & mask
+                neighbor_h = h + costs[d][tile][blank] - costs[d][tile][neighbor_blank]
+            else:
+                neighbor_h = heuristic(unpack_state(neighbor, rows, cols), targets[d])
+            heapq.heappush(open_set[d], (max(tentative_g_score + neighbor_h, 2 * tentative_g_score),
+                                         tentative_g_score, neighbor_h, neighbor, neighbor_blank))
+
+    if meeting is None:
+        return None, None
+
+    # Caminho: do encontro ate o inicio (invertido) e do encontro ate o objetivo
+    codes = [meeting]
+    while codes[-1] in came_from[0]:
+        codes.append(came_from[0][codes[-1]])
+    codes.reverse()
+    while codes[-1] in came_from[1]:
+        codes.append(came_from[1][codes[-1]])
+    path = [unpack_state(code, rows, cols) for code in codes[1:]]
+    return path, {code: g for g, code in enumerate(codes)}
+
+def table_search(start, goal, heuristic=None):
+    """Solucao otima do 8-puzzle por consulta na tabela completa de distancias
+
+    Modo opcional para muitas consultas contra poucos objetivos: a primeira
+    chamada para um objetivo constroi a tabela (BFS em todos os estados) ou a
+    carrega de PDB_DIR; as demais so descem pela tabela. heuristic e ignorada
+    (existe para ter a mesma assinatura de a_star/ida_star).
+    Retorna (caminho, g_score) como ida_star.
+    """
+    if not is_solvable(start, goal):
+        return None, None
+    path = distance_table(as_tuple(goal)).solve(start)
+    g_score = {pack_state(start)[0]: 0}
+    for g, state in enumerate(path, 1):
+        g_score[pack_state(state)[0]] = g
+    return path, g_score
 
 def get_neighbors(state):
     """Retorna os vizinhos de um estado"""
-    neighbors = []
-    zero_row, zero_col = next((r, c) for r in range(len(state)) 
-                               for c in range(len(state[0])) if state[r][c] == 0)
-    possible_moves = [(zero_row - 1, zero_col), (zero_row + 1, zero_col),
-                      (zero_row, zero_col - 1), (zero_row, zero_col + 1)]
-
-    for r, c in possible_moves:
-        if 0 <= r < len(state) and 0 <= c < len(state[0]):
-            new_state = [list(row) for row in state]
-            new_state[zero_row][zero_col], new_state[r][c] = new_state[r][c], new_state[zero_row][zero_col]
-            neighbors.append(tuple(tuple(row) for row in new_state))
+    rows, cols = len(state), len(state[0])
+    code, blank = pack_state(state)
+    return [unpack_state(neighbor, rows, cols)
+            for neighbor, _ in get_packed_neighbors(code, blank, make_move_table(rows, cols), tile_bits(rows, cols))]
 
+def get_packed_neighbors(code, blank, moves, bits):
+    """Retorna os vizinhos (estado compactado, posicao do vazio) de um estado compactado"""
+    mask = (1 << bits) - 1
+    neighbors = []
+    for pos in moves[blank]:
+        tile = (code >> (pos * bits)) & mask
+        neighbors.append((code - (tile << (pos * bits)) + (tile << (blank * bits)), pos))
     return neighbors
 
 def run_experiments(start_state, goal_state):
@@ -67,29 +457,26 @@ def run_experiments(start_state, goal_state):
     for row in goal_state:
         print(row)
 
-    # Executa A* com h1
-    start_time = time.time()
-    path_h1, g_score_h1 = a_star(start_state, goal_state, h1)
-    time_h1 = time.time() - start_time
-    nodes_h1 = len(path_h1) - 1 if path_h1 else 0
-
-    print(f"\nExecutando Experimento com h1...")
-    print(f"h1 - Nos gerados: {nodes_h1}, Tempo: {time_h1:.4f} segundos, Valor g(n): {g_score_h1[str(goal_state)] if path_h1 else 'Infinito'}")
-
-    # Executa A* com h2
-    start_time = time.time()
-    path_h2, g_score_h2 = a_star(start_state, goal_state, h2)
-    time_h2 = time.time() - start_time
-    nodes_h2 = len(path_h2) - 1 if path_h2 else 0
+    heuristics = [('h1', 'h1 (pecas fora)', h1), ('h2', 'h2 (Manhattan)', h2), ('h3', 'h3 (PDB aditivo)', h3)]
+    results = []
+    for name, label, heuristic in heuristics:
+        # Executa A* com a heuristica
+        stats = SearchStats()
+        path, g_score = a_star(start_state, goal_state, heuristic, stats=stats)
+        cost = g_score[pack_state(goal_state)[0]] if path is not None else 'Infinito'
+        results.append((label, stats, cost))
 
-    print(f"\nExecutando Experimento com h2...")
-    print(f"h2 - Nos gerados: {nodes_h2}, Tempo: {time_h2:.4f} segundos, Valor g(n): {g_score_h2[str(goal_state)] if path_h2 else 'Infinito'}")
+        print(f"\nExecutando Experimento com {name}...")
+        print(f"{name} - Nos gerados: {stats.generated}, Nos expandidos: {stats.expanded}, "
+              f"Tempo: {stats.total_time:.4f} segundos, Valor g(n): {cost}")
+        print(f"{name} - Tempo em heuristica: {stats.heuristic_time:.4f} s, sucessores: {stats.successor_time:.4f} s, "
+              f"heap: {stats.heap_time:.4f} s, pico da fronteira: {stats.peak_open}")
 
     # Resultados comparativos
     print("\nResultados comparativos:")
-    print(f"{'Heuristica':<20} {'Nos gerados':<15} {'Tempo (s)':<15} {'Valor g(n)':<15}")
-    print(f"{'h1 (pecas fora)':<20} {nodes_h1:<15} {time_h1:<15.4f} {g_score_h1[str(goal_state)] if path_h1 else 'Infinito':<15}")
-    print(f"{'h2 (Manhattan)':<20} {nodes_h2:<15} {time_h2:<15.4f} {g_score_h2[str(goal_state)] if path_h2 else 'Infinito':<15}")
+    print(f"{'Heuristica':<20} {'Nos gerados':<15} {'Nos expandidos':<15} {'Tempo (s)':<15} {'Valor g(n)':<15}")
+    for label, stats, cost in results:
+        print(f"{label:<20} {stats.generated:<15} {stats.expanded:<15} {stats.total_time:<15.4f} {cost:<15}")
 
 # Definir os estados iniciais e finais para os experimentos
 start_state_01 = (
@@ -116,7 +503,8 @@ goal_state_05 = (
     (7, 8, 0)
 )
 
-# Executar os experimentos
-run_experiments(start_state_01, goal_state_01)
-print("\n" + "="*50 + "\n")
-run_experiments(start_state_05, goal_state_05)
+if __name__ == "__main__":
+    # Executar os experimentos
+    run_experiments(start_state_01, goal_state_01)
+    print("\n" + "="*50 + "\n")
+    run_experiments(start_state_05, goal_state_05)
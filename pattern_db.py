@@ -0,0 +1,174 @@
+"""Bancos de dados de padroes (PDB) aditivos e disjuntos para o quebra-cabeca
+
+Cada padrao e um grupo de pecas. A tabela do padrao guarda, para cada
+combinacao de posicoes dessas pecas, o numero minimo de movimentos *das pecas
+do padrao* para leva-las ao objetivo (busca em largura retrograda 0-1 a partir
+do objetivo). Como os padroes sao disjuntos e so contam movimentos das proprias
+pecas, a soma das tabelas continua admissivel.
+
+As tabelas sao gravadas em um arquivo binario e lidas com mmap, entao varios
+processos compartilham as mesmas paginas.
+"""
+import mmap
+import os
+import struct
+from collections import deque
+
+MAGIC = b'PDB1'
+UNSEEN = 255
+
+def default_patterns(rows, cols):
+    """Particao padrao das pecas: grupos de 4 (3x3) ou 5 (4x4 em diante) pecas"""
+    tiles = list(range(1, rows * cols))
+    size = 4 if rows * cols <= 9 else 5
+    return [tuple(tiles[i:i + size]) for i in range(0, len(tiles), size)]
+
+def neighbor_cells(rows, cols):
+    """Para cada posicao, as posicoes vizinhas no tabuleiro"""
+    cells = []
+    for pos in range(rows * cols):
+        r, c = divmod(pos, cols)
+        cells.append(tuple(nr * cols + nc
+                           for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                           if 0 <= nr < rows and 0 <= nc < cols))
+    return cells
+
+def build_pattern_table(goal, pattern):
+    """Constroi a tabela de um padrao por BFS 0-1 retrograda a partir do objetivo
+
+    O indice da tabela e sum(posicao da i-esima peca * N**i), com N = numero de
+    posicoes. Mover uma peca do padrao custa 1; mover qualquer outra custa 0.
+    """
+    rows, cols = len(goal), len(goal[0])
+    size = rows * cols
+    cells = neighbor_cells(rows, cols)
+    goal_pos = {tile: i * cols + j for i, row in enumerate(goal) for j, tile in enumerate(row)}
+    k = len(pattern)
+    powers = [size ** i for i in range(k)]
+
+    start = goal_pos[0] + size * sum(goal_pos[tile] * powers[i] for i, tile in enumerate(pattern))
+    dist = bytearray([UNSEEN]) * (size ** (k + 1))
+    expanded = bytearray(size ** (k + 1))
+    table = bytearray([UNSEEN]) * (size ** k)
+    dist[start] = 0
+    queue = deque([start])
+
+    while queue:
+        key = queue.popleft()
+        if expanded[key]:
+            continue
+        expanded[key] = 1
+        d = dist[key]
+        blank, index = key % size, key // size
+        if d < table[index]:
+            table[index] = d
+
+        occupied = {}
+        rest = index
+        for i in range(k):
+            rest, pos = divmod(rest, size)
+            occupied[pos] = i
+
+        for cell in cells[blank]:
+            if cell in occupied:
+                new_key = cell + size * (index + (blank - cell) * powers[occupied[cell]])
+                if d + 1 < dist[new_key]:
+                    dist[new_key] = d + 1
+                    queue.append(new_key)
+            else:
+                new_key = cell + size * index
+                if d < dist[new_key]:
+                    dist[new_key] = d
+                    queue.appendleft(new_key)
+    return table
+
+def save_pdb(path, goal, patterns, tables):
+    """Grava o objetivo, os padroes e as tabelas em um arquivo binario compacto"""
+    rows, cols = len(goal), len(goal[0])
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<BBB', rows, cols, len(patterns)))
+        f.write(bytes(tile for row in goal for tile in row))
+        for pattern in patterns:
+            f.write(struct.pack('<B', len(pattern)))
+            f.write(bytes(pattern))
+        for table in tables:
+            f.write(table)
+
+def load_pdb(path):
+    """Abre um arquivo de PDB com mmap (somente leitura)"""
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:4] != MAGIC:
+        raise ValueError(f"Arquivo de PDB invalido: {path}")
+    rows, cols, count = struct.unpack_from('<BBB', data, 4)
+    size = rows * cols
+    offset = 7
+    goal = tuple(tuple(data[offset + r * cols:offset + (r + 1) * cols]) for r in range(rows))
+    offset += size
+    patterns = []
+    for _ in range(count):
+        k = data[offset]
+        patterns.append(tuple(data[offset + 1:offset + 1 + k]))
+        offset += 1 + k
+    view = memoryview(data)
+    tables = []
+    for pattern in patterns:
+        length = size ** len(pattern)
+        tables.append(view[offset:offset + length])
+        offset += length
+    return PatternDatabase(goal, patterns, tables, data)
+
+def build_pdb(goal, patterns=None):
+    """Constroi em memoria o PDB aditivo de um objetivo"""
+    goal = tuple(tuple(row) for row in goal)
+    if patterns is None:
+        patterns = default_patterns(len(goal), len(goal[0]))
+    patterns = [tuple(pattern) for pattern in patterns]
+    return PatternDatabase(goal, patterns, [build_pattern_table(goal, pattern) for pattern in patterns])
+
+def load_or_build(goal, path, patterns=None):
+    """Carrega o PDB de path; se nao existir, constroi, grava e carrega"""
+    if not os.path.exists(path):
+        pdb = build_pdb(goal, patterns)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Grava em arquivo temporario para outros processos nunca lerem um arquivo parcial
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        save_pdb(temp_path, pdb.goal, pdb.patterns, pdb.tables)
+        os.replace(temp_path, path)
+    pdb = load_pdb(path)
+    if pdb.goal != tuple(tuple(row) for row in goal):
+        raise ValueError(f"O PDB em {path} foi construido para outro objetivo")
+    return pdb
+
+def pdb_filename(goal):
+    """Nome de arquivo padrao do PDB de um objetivo"""
+    return f"pdb_{len(goal)}x{len(goal[0])}_" + "-".join(str(tile) for row in goal for tile in row) + ".bin"
+
+class PatternDatabase:
+    """Heuristica aditiva: soma das tabelas de padroes disjuntos
+
+    Pode ser passada diretamente como heuristica para a_star/ida_star.
+    """
+
+    def __init__(self, goal, patterns, tables, data=None):
+        self.goal = goal
+        self.patterns = patterns
+        self.tables = tables
+        self.size = len(goal) * len(goal[0])
+        self.data = data  # mantem o mmap aberto enquanto houver tabelas
+
+    def __call__(self, state, goal=None):
+        size = self.size
+        positions = [0] * size
+        for pos, tile in enumerate(tile for row in state for tile in row):
+            positions[tile] = pos
+        total = 0
+        for pattern, table in zip(self.patterns, self.tables):
+            index = 0
+            for tile in reversed(pattern):
+                index = index * size + positions[tile]
+            total += table[index]
+        return total
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+pytest.importorskip("deap")
+
+import AG
+import AG_ex1
+
+
+@pytest.mark.parametrize("module", [AG, AG_ex1])
+def test_evaluate_population_matches_evaluate(module):
+    module.setup()
+    random.seed(0)
+    population = module.toolbox.population(n=40)
+    module.toolbox.evaluate_population(population)
+    for ind in population:
+        assert ind.fitness.values == module.toolbox.evaluate(ind)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_partition_executors_match_serial(executor):
+    results = []
+    for mode in ("serial", executor):
+        random.seed(3)
+        population = AG.main(executor=mode, workers=2)
+        results.append([ind.fitness.values for ind in population])
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_tsp_executors_match_serial(executor):
+    import AG_ex2
+    results = []
+    for mode in ("serial", executor):
+        random.seed(3)
+        results.append(AG_ex2.algoritmo_genetico(AG_ex2.carregar_matriz('uk12'), num_geracoes=30,
+                                                 plotar=False, executor=mode, trabalhadores=2))
+    assert results[0] == results[1]
+
+
+def test_tsp_array_engine():
+    import numpy as np
+    import AG_ex2
+    matriz = np.asarray(AG_ex2.carregar_matriz('ha30'))
+    random.seed(0)
+    populacao = AG_ex2.criar_populacao(20, len(matriz))
+    distancias = AG_ex2.calcular_distancias(populacao, matriz)
+    assert distancias.tolist() == [AG_ex2.calcular_distancia(rota, matriz) for rota in populacao.tolist()]
+
+    pai1, pai2 = populacao[0], populacao[1]
+    filho = AG_ex2.cruzar(pai1, pai2, 7)
+    esperado = pai1[:7].tolist() + [c for c in pai2.tolist() if c not in pai1[:7].tolist()]
+    assert filho.tolist() == esperado
+
+    rota, distancia = AG_ex2.algoritmo_genetico(matriz, num_geracoes=20, plotar=False)
+    assert sorted(rota) == list(range(len(matriz)))
+    assert distancia == AG_ex2.calcular_distancia(rota, matriz)
+
+
+def test_tsp_memetic_mode_improves_on_plain_ga():
+    import AG_ex2
+    random.seed(0)
+    matriz = AG_ex2.carregar_matriz('ha30')
+    _, simples = AG_ex2.algoritmo_genetico(matriz, num_geracoes=10, plotar=False)
+    random.seed(0)
+    rota, memetico = AG_ex2.algoritmo_genetico(matriz, num_geracoes=10, plotar=False, memetico=True)
+    assert memetico < simples
+    assert memetico == AG_ex2.calcular_distancia(rota, matriz)
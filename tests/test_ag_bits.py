@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import AG_bits
+
+
+def test_pack_unpack_roundtrip():
+    rng = np.random.default_rng(0)
+    genes = rng.integers(0, 2, size=(7, 130), dtype=np.uint8)
+    population = AG_bits.pack(genes)
+    assert population.shape == (7, 3) and population.dtype == np.uint64
+    assert (AG_bits.unpack(population, 130) == genes).all()
+
+
+def test_evaluate_population_matches_lists():
+    rng = np.random.default_rng(1)
+    numbers = rng.integers(1, 101, size=70)
+    genes = rng.integers(0, 2, size=(10, 70), dtype=np.uint8)
+    fits = AG_bits.evaluate_population(AG_bits.pack(genes), numbers, block_size=3)
+    for genome, fit in zip(genes.tolist(), fits.tolist()):
+        a = sum(n for n, g in zip(numbers.tolist(), genome) if g == 0)
+        b = sum(n for n, g in zip(numbers.tolist(), genome) if g == 1)
+        assert fit == abs(a - b)
+
+
+def test_crossover_is_one_point_on_genes():
+    rng = np.random.default_rng(2)
+    n_genes = 150
+    genes = rng.integers(0, 2, size=(6, n_genes), dtype=np.uint8)
+    population = AG_bits.pack(genes)
+    AG_bits.one_point_crossover(np.random.default_rng(3), population, n_genes, prob_cross=1.0)
+    children = AG_bits.unpack(population, n_genes)
+    cuts = np.random.default_rng(3)
+    cuts.random(3)
+    for pair, cut in enumerate(cuts.integers(1, n_genes, size=3)):
+        p1, p2 = genes[2 * pair], genes[2 * pair + 1]
+        assert (children[2 * pair] == np.concatenate((p1[:cut], p2[cut:]))).all()
+        assert (children[2 * pair + 1] == np.concatenate((p2[:cut], p1[cut:]))).all()
+
+
+def test_mutation_keeps_padding_clear_and_run_is_consistent():
+    rng = np.random.default_rng(4)
+    population = AG_bits.random_population(rng, 20, 100)
+    AG_bits.flip_bit_mutation(rng, population, 100, prob_mut=1.0, indpb=0.5)
+    assert (AG_bits.unpack(population, 128)[:, 100:] == 0).all()
+
+    numbers = np.arange(1, 41)
+    genome, best, _, _ = AG_bits.run(numbers, n_gen=30, seed=0)
+    assert best == abs(numbers[genome == 0].sum() - numbers[genome == 1].sum())
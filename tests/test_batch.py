@@ -0,0 +1,31 @@
+from batch import parse_instance, read_instances, solve_batch
+from main import a_star, h2, ida_star
+from tests.test_main import scramble, square_goal
+
+
+def test_parse_instance_with_and_without_goal():
+    start, goal = parse_instance("2 8 3 1 6 4 0 7 5 ; 1 2 3 8 0 4 7 6 5")
+    assert start == ((2, 8, 3), (1, 6, 4), (0, 7, 5))
+    assert goal == ((1, 2, 3), (8, 0, 4), (7, 6, 5))
+    assert parse_instance("1 2 3 4 5 6 7 8 0")[1] == square_goal(3)
+
+
+def test_a_star_rejects_unsolvable_instance():
+    assert a_star(((2, 1, 3), (4, 5, 6), (7, 8, 0)), square_goal(3), h2) == (None, None)
+
+
+def test_solve_batch_streams_all_results(tmp_path):
+    goal = square_goal(3)
+    starts = [scramble(goal, 30, seed) for seed in range(6)]
+    lines = [" ".join(str(tile) for row in start for tile in row) for start in starts]
+    lines.insert(2, "# comentario")
+    lines.append("2 1 3 4 5 6 7 8 0")
+    path = tmp_path / "instances.txt"
+    path.write_text("\n".join(lines) + "\n")
+
+    instances = read_instances(path)
+    results = sorted(solve_batch(instances, ida_star, h2, processes=2), key=lambda r: r['index'])
+    assert [r['index'] for r in results] == list(range(7))
+    for start, result in zip(starts, results):
+        assert result['moves'] == len(a_star(start, goal, h2)[0])
+    assert results[-1]['solvable'] is False
@@ -0,0 +1,21 @@
+from benchmark import compare, random_8puzzles
+from main import a_star, h2
+
+
+def test_random_8puzzles_have_exact_depth():
+    instances = random_8puzzles(12, 5, seed=1)
+    assert instances == random_8puzzles(12, 5, seed=1)
+    for start, goal in instances:
+        path, _ = a_star(start, goal, h2)
+        assert len(path) == 12
+
+
+def test_compare_flags_time_and_quality_regressions():
+    baseline = [{'config': 'a', 'wall_time': 1.0, 'quality': 10},
+                {'config': 'b', 'wall_time': 1.0, 'quality': 10}]
+    records = [{'config': 'a', 'wall_time': 1.1, 'quality': 10},
+               {'config': 'b', 'wall_time': 1.5, 'quality': 11},
+               {'config': 'c', 'wall_time': 9.0, 'quality': 99}]
+    regressions = compare(records, baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert all(regression.startswith('b:') for regression in regressions)
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from busca_local import busca_local, vizinhos_mais_proximos
+
+
+def distancia(rota, matriz):
+    return sum(matriz[rota[i - 1]][rota[i]] for i in range(len(rota)))
+
+
+def matriz_aleatoria(n, semente):
+    rng = random.Random(semente)
+    pontos = [(rng.random(), rng.random()) for _ in range(n)]
+    return [[round(((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5 * 1000) for x2, y2 in pontos] for x1, y1 in pontos]
+
+
+@pytest.mark.parametrize("bits_nao_olhar", [True, False])
+def test_busca_local_delta_matches_tour_length(bits_nao_olhar):
+    matriz = matriz_aleatoria(60, 1)
+    vizinhos = vizinhos_mais_proximos(matriz, 8)
+    for semente in range(5):
+        rota = list(range(60))
+        random.Random(semente).shuffle(rota)
+        antes = distancia(rota, matriz)
+        delta = busca_local(rota, matriz, vizinhos, bits_nao_olhar)
+        assert sorted(rota) == list(range(60))
+        assert distancia(rota, matriz) == antes + delta
+        assert delta < 0
+
+
+def test_resultado_e_2opt_otimo_nos_vizinhos():
+    matriz = matriz_aleatoria(40, 2)
+    vizinhos = vizinhos_mais_proximos(matriz, 39)
+    rota = list(range(40))
+    busca_local(rota, matriz, vizinhos)
+    n = len(rota)
+    for i in range(n):
+        for j in range(i + 2, n):
+            a, b, c, d = rota[i], rota[(i + 1) % n], rota[j], rota[(j + 1) % n]
+            if d != a:
+                assert matriz[a][c] + matriz[b][d] >= matriz[a][b] + matriz[c][d]
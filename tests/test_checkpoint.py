@@ -0,0 +1,76 @@
+import json
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from checkpoint import GenerationLog, load_checkpoint, read_log
+
+
+class Interrupcao(Exception):
+    pass
+
+
+def interromper_apos(monkeypatch, modulo, nome, chamadas):
+    original = getattr(modulo, nome)
+    contador = {'n': 0}
+
+    def funcao(*args, **kwargs):
+        contador['n'] += 1
+        if contador['n'] > chamadas:
+            raise Interrupcao()
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(modulo, nome, funcao)
+
+
+def test_tsp_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+    import AG_ex2
+    matriz = AG_ex2.carregar_matriz('ha30')
+    random.seed(5)
+    esperado = AG_ex2.algoritmo_genetico(matriz, num_geracoes=40, plotar=False)
+
+    arquivo = str(tmp_path / "tsp.ckpt")
+    log = str(tmp_path / "tsp.jsonl")
+    random.seed(5)
+    with monkeypatch.context() as m:
+        interromper_apos(m, AG_ex2, "proxima_geracao", 25)
+        with pytest.raises(Interrupcao):
+            AG_ex2.algoritmo_genetico(matriz, num_geracoes=40, plotar=False, checkpoint=arquivo, log=log)
+    assert load_checkpoint(arquivo)["geracao"] == 20
+    assert len(read_log(log)) == 26
+
+    random.seed(123)  # o estado aleatório vem do checkpoint
+    assert AG_ex2.algoritmo_genetico(matriz, num_geracoes=40, plotar=False, checkpoint=arquivo, log=log) == esperado
+    assert [linha['geracao'] for linha in read_log(log)] == list(range(40))
+
+
+def test_partition_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+    pytest.importorskip("deap")
+    import AG
+    random.seed(2)
+    esperado = [ind.fitness.values for ind in AG.main()]
+
+    arquivo = str(tmp_path / "particao.ckpt")
+    random.seed(2)
+    with monkeypatch.context() as m:
+        interromper_apos(m, AG, "next_generation", 73)
+        with pytest.raises(Interrupcao):
+            AG.main(checkpoint=arquivo, checkpoint_every=10)
+    assert load_checkpoint(arquivo)["generation"] == 70
+    populacao = AG.main(checkpoint=arquivo, log=str(tmp_path / "particao.csv"))
+    assert [ind.fitness.values for ind in populacao] == esperado
+    assert len(read_log(str(tmp_path / "particao.csv"))) == 80
+
+
+def test_generation_log_csv_and_jsonl(tmp_path):
+    for nome in ("log.csv", "log.jsonl"):
+        caminho = str(tmp_path / nome)
+        log = GenerationLog(caminho, ["geracao", "valor"])
+        for geracao in range(3):
+            log.write(geracao=geracao, valor=geracao * 1.5)
+        log.close()
+        assert read_log(caminho) == [{'geracao': g, 'valor': g * 1.5} for g in range(3)]
+    with open(tmp_path / "log.jsonl") as f:
+        assert json.loads(f.readline()) == {'geracao': 0, 'valor': 0.0}
@@ -0,0 +1,45 @@
+import pytest
+
+from distance_table import build_table, load_or_build, state_index, table_filename
+from main import a_star, get_neighbors, h2, pack_state, table_search
+from tests.test_main import scramble, square_goal
+
+
+def test_index_is_a_bijection_on_reachable_states():
+    table = build_table(square_goal(3))
+    assert len(table) == 181440
+    assert 255 not in table
+    assert max(table) == 31
+
+
+def test_table_search_is_optimal(tmp_path, monkeypatch):
+    monkeypatch.setattr('main.PDB_DIR', str(tmp_path))
+    goal = ((1, 2, 3), (8, 0, 4), (7, 6, 5))
+    for seed in range(20):
+        start = scramble(goal, 60, seed)
+        expected, _ = a_star(start, goal, h2)
+        path, g_score = table_search(start, goal)
+        assert len(path) == len(expected)
+        state = start
+        for step in path:
+            assert step in get_neighbors(state)
+            state = step
+        assert state == goal
+        assert g_score[pack_state(goal)[0]] == len(path)
+    assert (tmp_path / table_filename(goal)).exists()
+    assert table_search(((2, 1, 3), (8, 0, 4), (7, 6, 5)), goal) == (None, None)
+    assert table_search(goal, goal)[0] == []
+
+
+def test_table_is_reloaded_with_mmap(tmp_path):
+    goal = square_goal(3)
+    path = tmp_path / "dist.bin"
+    distances = load_or_build(goal, path)
+    loaded = load_or_build(goal, path)
+    start = scramble(goal, 40, 5)
+    assert loaded(start) == distances(start) == len(a_star(start, goal, h2)[0])
+    assert loaded.table[state_index([tile for row in goal for tile in row])] == 0
+    with pytest.raises(ValueError):
+        load_or_build(((1, 2, 3), (8, 0, 4), (7, 6, 5)), path)
+    with pytest.raises(ValueError):
+        build_table(square_goal(4))
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from fitness_cache import FitnessCache, lookup_population, partition_key, tour_key
+
+
+def test_tour_key_ignores_rotation_and_direction():
+    rota = [3, 1, 4, 0, 2, 5]
+    chave = tour_key(rota)
+    assert tour_key(rota[2:] + rota[:2]) == chave
+    assert tour_key(rota[::-1]) == chave
+    assert tour_key([3, 1, 0, 4, 2, 5]) != chave
+
+
+def test_partition_key_ignores_complement():
+    genoma = [1, 0, 1, 1, 0, 0, 0, 1, 1]
+    assert partition_key(genoma) == partition_key([1 - g for g in genoma])
+    assert partition_key(genoma) != partition_key(genoma[:-1] + [0])
+
+
+def test_lru_eviction_and_counters():
+    cache = FitnessCache(capacity=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' passa a ser o mais recente
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 2)
+
+
+def test_lookup_population_deduplicates_pending():
+    cache = FitnessCache()
+    cache.put('x', 5)
+    valores, pendentes = lookup_population(cache, ['x', 'y', 'y', 'z'])
+    assert valores == [5, None, None, None]
+    assert pendentes == {'y': [1, 2], 'z': [3]}
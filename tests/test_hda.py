@@ -0,0 +1,33 @@
+import pytest
+
+from hda import hda_star, owner
+from main import a_star, get_neighbors, h2, pack_state
+from tests.test_main import scramble, square_goal
+
+
+@pytest.mark.parametrize("n, steps, cases", [(3, 60, 4), (4, 60, 2)])
+def test_hda_star_matches_a_star(n, steps, cases):
+    goal = square_goal(n)
+    for seed in range(cases):
+        start = scramble(goal, steps, seed)
+        expected, _ = a_star(start, goal, h2)
+        path, _ = hda_star(start, goal, h2, workers=3, round_size=50)
+        assert len(path) == len(expected)
+        state = start
+        for step in path:
+            assert step in get_neighbors(state)
+            state = step
+        assert state == goal
+
+
+def test_hda_star_edge_cases():
+    goal = square_goal(3)
+    assert hda_star(goal, goal, h2, workers=2) == ([], {pack_state(goal)[0]: 0})
+    assert hda_star(((2, 1, 3), (4, 5, 6), (7, 8, 0)), goal, h2, workers=2) == (None, None)
+    assert len(hda_star(scramble(goal, 40, 1), goal, h2, workers=1)[0]) == len(a_star(scramble(goal, 40, 1), goal, h2)[0])
+
+
+def test_owner_spreads_states():
+    goal = square_goal(4)
+    owners = {owner(pack_state(scramble(goal, 30, seed))[0], 4) for seed in range(40)}
+    assert owners == {0, 1, 2, 3}
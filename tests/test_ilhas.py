@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from ilhas import IlhaParticao, IlhaTSP, destinos, executar_ilhas
+
+
+def test_destinos_sao_permutacoes_sem_ponto_fixo():
+    assert destinos(4, 'anel', 0, 10) == [1, 2, 3, 0]
+    for geracao in range(1, 20):
+        ordem = destinos(5, 'aleatoria', 7, geracao)
+        assert sorted(ordem) == list(range(5))
+        assert all(destino != i for i, destino in enumerate(ordem))
+        assert ordem == destinos(5, 'aleatoria', 7, geracao)
+
+
+@pytest.mark.parametrize("topologia", ['anel', 'aleatoria'])
+def test_executar_ilhas_tsp(topologia):
+    import AG_ex2
+    matriz = AG_ex2.carregar_matriz('uk12')
+    resultado = executar_ilhas(IlhaTSP(matriz), num_ilhas=3, geracoes=12,
+                               intervalo_migracao=4, topologia=topologia)
+    assert len(resultado['historicos']) == 3
+    assert all(len(historico) == 12 for historico in resultado['historicos'])
+    assert sorted(resultado['melhor']) == list(range(12))
+    assert resultado['aptidao'] == AG_ex2.calcular_distancia(resultado['melhor'], matriz)
+    assert resultado['aptidao'] == min(historico[-1][0] for historico in resultado['historicos'])
+
+
+def test_executar_ilhas_particao():
+    pytest.importorskip("deap")
+    numeros = list(range(1, 31))
+    resultado = executar_ilhas(IlhaParticao(numeros), num_ilhas=2, geracoes=10, intervalo_migracao=3)
+    genoma = resultado['melhor']
+    a = sum(n for n, g in zip(numeros, genoma) if g == 0)
+    b = sum(n for n, g in zip(numeros, genoma) if g == 1)
+    assert resultado['aptidao'] == abs(a - b)
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import pytest
+
+MODULES = ["main", "batch", "hda", "benchmark", "AG_bits", "AG_ex2", "ilhas", "checkpoint", "AG", "AG_ex1"]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_has_no_side_effects(module):
+    if module.startswith("AG") or module == "ilhas":
+        pytest.importorskip("numpy")
+    if module in ("AG", "AG_ex1"):
+        pytest.importorskip("deap")
+    code = f"import sys, {module}; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout == "False\n"
+    assert result.stderr == ""
+
+
+def test_tsp_datasets_load_on_demand():
+    pytest.importorskip("numpy")
+    import AG_ex2
+    for nome, tamanho in (("uk12", 12), ("ha30", 30)):
+        matriz = AG_ex2.carregar_matriz(nome)
+        assert len(matriz) == tamanho and all(len(linha) == tamanho for linha in matriz)
+        assert all(matriz[i][i] == 0 for i in range(tamanho))
+    assert AG_ex2.carregar_matriz("uk12")[0][1] == 300
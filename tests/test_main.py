@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from main import (a_star, bidirectional_a_star, get_neighbors, h1, h2, ida_star, is_solvable, make_move_table,
+                  pack_state, SearchStats)
+
+
+def scramble(goal, steps, seed):
+    """Embaralha o objetivo com movimentos aleatorios do vazio (sempre soluvel)"""
+    rng = random.Random(seed)
+    rows, cols = len(goal), len(goal[0])
+    moves = make_move_table(rows, cols)
+    board = [tile for row in goal for tile in row]
+    blank = board.index(0)
+    for _ in range(steps):
+        pos = rng.choice(moves[blank])
+        board[blank], board[pos] = board[pos], 0
+        blank = pos
+    return tuple(tuple(board[r * cols:(r + 1) * cols]) for r in range(rows))
+
+
+def square_goal(n):
+    tiles = list(range(1, n * n)) + [0]
+    return tuple(tuple(tiles[r * n:(r + 1) * n]) for r in range(n))
+
+
+def test_ida_star_first_bound_not_optimal():
+    start = ((0, 7, 3), (1, 4, 2), (5, 8, 6))
+    goal = square_goal(3)
+    assert h2(start, goal) < 16
+    for table_size in (None, 1024):
+        path, _ = ida_star(start, goal, h2, table_size=table_size)
+        assert len(path) == 16
+        assert path[-1] == goal
+
+
+@pytest.mark.parametrize("n, steps, cases", [(3, 40, 15), (4, 30, 3)])
+@pytest.mark.parametrize("table_size", [None, 4096])
+def test_ida_star_matches_a_star(n, steps, cases, table_size):
+    goal = square_goal(n)
+    for seed in range(cases):
+        start = scramble(goal, steps, seed)
+        expected, _ = a_star(start, goal, h2)
+        path, _ = ida_star(start, goal, h2, table_size=table_size)
+        assert len(path) == len(expected)
+
+
+def test_ida_star_generic_heuristic():
+    goal = square_goal(3)
+    start = scramble(goal, 20, 7)
+    expected, _ = a_star(start, goal, h1)
+    path, _ = ida_star(start, goal, lambda state, goal: h2(state, goal))
+    assert len(path) == len(expected)
+
+
+def test_unsolvable_instance():
+    goal = square_goal(3)
+    start = ((2, 1, 3), (4, 5, 6), (7, 8, 0))
+    assert not is_solvable(start, goal)
+    assert is_solvable(scramble(goal, 31, 0), goal)
+    assert ida_star(start, goal, h2) == (None, None)
+
+
+@pytest.mark.parametrize("n, steps, cases", [(3, 60, 15), (4, 60, 3)])
+def test_bidirectional_a_star_matches_a_star(n, steps, cases):
+    goal = square_goal(n)
+    for seed in range(cases):
+        start = scramble(goal, steps, seed)
+        expected, _ = a_star(start, goal, h2)
+        path, g_score = bidirectional_a_star(start, goal, h2)
+        assert len(path) == len(expected)
+        assert path[-1] == goal
+        state = start
+        for step in path:
+            assert step in get_neighbors(state)
+            state = step
+        assert g_score[pack_state(goal)[0]] == len(path)
+
+
+def test_bidirectional_a_star_edge_cases():
+    goal = square_goal(3)
+    assert bidirectional_a_star(goal, goal, h2)[0] == []
+    assert bidirectional_a_star(((2, 1, 3), (4, 5, 6), (7, 8, 0)), goal, h2) == (None, None)
+    start = ((0, 7, 3), (1, 4, 2), (5, 8, 6))
+    assert len(bidirectional_a_star(start, goal, lambda state, target: h1(state, target))[0]) == 16
+
+
+def test_get_neighbors_on_boards():
+    state = ((1, 2, 3), (4, 0, 5), (6, 7, 8))
+    assert sorted(get_neighbors(state)) == sorted([
+        ((1, 0, 3), (4, 2, 5), (6, 7, 8)),
+        ((1, 2, 3), (4, 7, 5), (6, 0, 8)),
+        ((1, 2, 3), (0, 4, 5), (6, 7, 8)),
+        ((1, 2, 3), (4, 5, 0), (6, 7, 8)),
+    ])
+
+
+def test_a_star_g_score_keyed_by_packed_state():
+    goal = square_goal(3)
+    start = scramble(goal, 20, 3)
+    path, g_score = a_star(start, goal, h2)
+    assert g_score[pack_state(goal)[0]] == len(path)
+
+
+def test_heuristics_accept_lists():
+    state = [[1, 2, 3], [4, 5, 6], [7, 0, 8]]
+    goal = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    assert h1(state, goal) == 1
+    assert h2(state, goal) == 1
+    path, _ = a_star(state, goal, h2)
+    assert path == [((1, 2, 3), (4, 5, 6), (7, 8, 0))]
+
+
+def test_a_star_stats_counters():
+    goal = square_goal(3)
+    start = scramble(goal, 40, 5)
+    stats = SearchStats(trace_memory=True)
+    seen = []
+    path, _ = a_star(start, goal, h1, stats=stats, callback=lambda s: seen.append(s.expanded), callback_every=50)
+    assert stats.expanded > len(path)
+    assert stats.generated >= stats.expanded
+    assert 0 < stats.duplicates < stats.generated
+    assert stats.peak_open > 0 and stats.peak_memory > 0
+    assert seen == list(range(50, stats.expanded + 1, 50))
+    ida_stats = SearchStats()
+    ida_star(start, goal, h2, stats=ida_stats)
+    assert ida_stats.generated >= ida_stats.expanded > 0
@@ -0,0 +1,36 @@
+from main import a_star, h2
+from pattern_db import build_pdb, load_or_build, load_pdb, pdb_filename, save_pdb
+from tests.test_main import scramble, square_goal
+
+
+def test_pdb_is_admissible_and_dominates_manhattan():
+    goal = square_goal(3)
+    pdb = build_pdb(goal)
+    assert pdb(goal) == 0
+    for seed in range(20):
+        start = scramble(goal, 40, seed)
+        path, _ = a_star(start, goal, h2)
+        assert h2(start, goal) <= pdb(start, goal) <= len(path)
+
+
+def test_pdb_roundtrip_through_mmap(tmp_path):
+    goal = ((1, 2, 3), (8, 0, 4), (7, 6, 5))
+    pdb = build_pdb(goal, patterns=[(1, 2, 3), (4, 5, 6), (7, 8)])
+    path = tmp_path / "db.bin"
+    save_pdb(path, pdb.goal, pdb.patterns, pdb.tables)
+    loaded = load_pdb(path)
+    assert loaded.goal == goal
+    assert loaded.patterns == pdb.patterns
+    for seed in range(10):
+        start = scramble(goal, 30, seed)
+        assert loaded(start) == pdb(start)
+
+
+def test_a_star_with_pdb_is_optimal(tmp_path):
+    goal = square_goal(3)
+    pdb = load_or_build(goal, str(tmp_path / pdb_filename(goal)))
+    for seed in range(10):
+        start = scramble(goal, 40, seed)
+        expected, _ = a_star(start, goal, h2)
+        path, _ = a_star(start, goal, pdb)
+        assert len(path) == len(expected)